@@ -1,5 +1,7 @@
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.app.db.database import SessionLocal
+from backend.app.db.database import SessionLocal, AsyncSessionLocal
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -7,3 +9,8 @@ def get_db() -> Session:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
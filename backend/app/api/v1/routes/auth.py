@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status, Form
 from sqlalchemy.orm import Session
-from backend.app.api.v1.services.auth import authenticate_user
+from backend.app.api.v1.services.auth import authenticate_user, auth_executor
+from backend.app.core.executor import ExecutorOverloadedError
 from backend.app.api.dependencies.db import get_db
 from backend.app.db.schemas.auth import LoginRequest, TokenResponse
 from backend.app.db.schemas.errors import (
     BadRequestError,
     UnauthorizedError,
+    ServiceUnavailableError,
     InternalServerError,
 )
 router = APIRouter()
@@ -16,6 +18,7 @@ router = APIRouter()
     responses={
         200: {"description": "Authentication successful. Token returned.", "model": TokenResponse},
         400: {"description": "Invalid request (missing username or password).", "model": BadRequestError},
+        503: {"description": "Too many logins in progress; retry later.", "model": ServiceUnavailableError},
         500: {"description": "Internal server error.", "model": InternalServerError},
     },
 )
@@ -49,10 +52,16 @@ async def login(
                 detail="Invalid request. Provide username and password in JSON or form data.",
             )
 
-        # Delegate authentication logic to the service
-        token = authenticate_user(username, password)
+        # Delegate authentication logic to the service; bcrypt runs on the auth executor
+        token = await auth_executor.run(authenticate_user, username, password)
         return {"access_token": token, "token_type": "bearer"}
 
+    except ExecutorOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except HTTPException as e:
         # Re-raise HTTP exceptions to propagate to the client
         raise e
@@ -1,16 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.db.schemas.books import Book, BookCreate, BookPut, BookPatch, BooksResponse, BookCreatedResponse, SuccessResponse
+from datetime import date
+from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from backend.app.db.schemas.books import Book, BookCreate, BookPut, BookPatch, BooksResponse, BookCreatedResponse, SuccessResponse, BulkResponse, ImportResponse, SearchResponse, BatchRequest, BatchResponse
 from backend.app.db.schemas.errors import (
     BadRequestError,
     UnauthorizedError,
     NotFoundError,
     ValidationError,
+    PreconditionFailedError,
     InternalServerError,
 )
-from backend.app.api.dependencies.db import get_db
+from backend.app.api.dependencies.db import get_db, get_async_db
+from backend.app.db.database import SessionLocal, AsyncSessionLocal
+from backend.app.core.config import settings
 from backend.app.core.security import verify_access_token
-from backend.app.api.v1.services.books import book_service
+from backend.app.core.pagination import InvalidCursorError
+from backend.app.core.ingest import RECORD_PARSERS
+from backend.app.core.search import InvalidSearchError
+from backend.app.core.etags import book_etag, list_etag, none_match, if_match_version
+from backend.app.api.v1.services.books import (
+    book_service,
+    async_book_service,
+    ThreadedBookService,
+    CoalescingBookService,
+    BatchingBookService,
+    read_coalescer,
+    write_committer,
+    EXPORT_FORMATS,
+    EXPORT_MEDIA_TYPES,
+    SORT_OPTIONS,
+    book_cache,
+    import_books,
+    page_json,
+    batch_json,
+    parse_fields,
+    project_response,
+)
+
+# Async handlers either await the AsyncSession service directly or hand the
+# sync service to the threadpool, depending on settings.ASYNC_DATABASE.
+if settings.ASYNC_DATABASE:
+    service, get_session, session_factory = async_book_service, get_async_db, AsyncSessionLocal
+else:
+    service, get_session, session_factory = ThreadedBookService(book_service), get_db, SessionLocal
+if settings.WRITE_BATCHING:
+    service = BatchingBookService(service, write_committer)
+if settings.READ_COALESCING:
+    # Coalesced reads run on a session of their own, not the request's
+    service = CoalescingBookService(service, read_coalescer, session_factory)
 
 # Global dependency to enforce token validation on all endpoints
 router = APIRouter(dependencies=[Depends(verify_access_token)])
@@ -26,12 +64,12 @@ router = APIRouter(dependencies=[Depends(verify_access_token)])
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def create_book(book: BookCreate, db: Session = Depends(get_db)):
+async def create_book(book: BookCreate, db=Depends(get_session)):
     """
     Create a new book.
     """
     try:
-        created_book = book_service.create_book(db, book)
+        created_book = await service.create_book(db, book)
         return {"book": created_book}
     except HTTPException as e:
         raise e
@@ -46,14 +84,270 @@ def create_book(book: BookCreate, db: Session = Depends(get_db)):
     response_model=BooksResponse,
     responses={
         200: {"description": "List of books retrieved successfully.", "model": BooksResponse},
+        304: {"description": "Not Modified (no book changed since the If-None-Match ETag)"},
         400: {"description": "Bad Request (Invalid query parameters)", "model": BadRequestError},
         401: {"description": "Unauthorized", "model": UnauthorizedError},
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def get_books(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+async def get_books(
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    sort: str = "id",
+    author: Optional[str] = None,
+    genre: Optional[str] = None,
+    published_from: Optional[date] = None,
+    published_to: Optional[date] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db=Depends(get_session),
+):
     """
     Retrieve a paginated list of books.
+
+    Pass the `next_cursor` of a response as `cursor` to fetch the following
+    page; cursor pages cost the same at any depth, unlike `skip`.
+    Set `include_total=false` to leave `total` out of the response.
+
+    Filter by exact `author` and `genre`, and by an inclusive
+    `published_from`/`published_to` range. `sort` is one of id, title,
+    author, genre or published_date, prefixed with `-` for descending order.
+    `fields` (e.g. `title,author`) returns only those fields, plus `id`.
+
+    The `ETag` changes whenever any book is written; send it back as
+    `If-None-Match` to get `304 Not Modified` while nothing changed.
+    """
+    if skip < 0 or limit < 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Query parameters 'skip' must be >= 0 and 'limit' must be > 0."
+        )
+    if cursor and skip:
+        raise HTTPException(
+            status_code=400,
+            detail="Query parameters 'skip' and 'cursor' cannot be combined."
+        )
+    if sort not in SORT_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query parameter 'sort' must be one of: {', '.join(SORT_OPTIONS)}."
+        )
+    if published_from and published_to and published_from > published_to:
+        raise HTTPException(
+            status_code=400,
+            detail="Query parameter 'published_from' must not be after 'published_to'."
+        )
+    projection = _parse_fields(fields)
+    try:
+        # Read the counter before the page so a concurrent write can only make the ETag older
+        changes = await service.get_change_counter(db)
+        etag = list_etag(changes, projection)
+        if none_match(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        books, total, next_cursor = await service.get_books(
+            db, skip, limit, cursor=cursor, sort=sort, include_total=include_total,
+            author=author, genre=genre, published_from=published_from, published_to=published_to,
+            fields=projection, as_of=changes,
+        )
+        return Response(
+            content=page_json(books, total, skip, limit, next_cursor, projection),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+def _parse_fields(fields: Optional[str]):
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Query parameter 'fields': {e}")
+
+def _check_bulk_size(items: list):
+    if not items:
+        raise HTTPException(status_code=400, detail="Bulk requests need at least one item.")
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bulk requests accept at most {settings.BULK_MAX_ITEMS} items."
+        )
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse,
+    responses={
+        200: {"description": "Per-item outcome of the bulk create.", "model": BulkResponse},
+        400: {"description": "Bad Request (Empty or oversized batch)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def create_books(items: List[Dict[str, Any]] = Body(..., examples=[[BookCreate.Config.json_schema_extra["example"]]]),
+                       db=Depends(get_session)):
+    """
+    Create many books in chunked transactions.
+    Items are validated individually; invalid items are reported and skipped.
+    """
+    _check_bulk_size(items)
+    try:
+        return await service.create_books(db, items)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResponse,
+    responses={
+        200: {"description": "Per-item outcome of the bulk update.", "model": BulkResponse},
+        400: {"description": "Bad Request (Empty or oversized batch)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def update_books(items: List[Dict[str, Any]] = Body(..., examples=[[{"id": 1, "genre": "Classics"}]]),
+                       db=Depends(get_session)):
+    """
+    Partially update many books, each item naming the book ID and the fields to change.
+    """
+    _check_bulk_size(items)
+    try:
+        return await service.update_books(db, items)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResponse,
+    responses={
+        200: {"description": "Per-item outcome of the bulk delete.", "model": BulkResponse},
+        400: {"description": "Bad Request (Empty or oversized batch)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        422: {"description": "Invalid input", "model": ValidationError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def delete_books(ids: List[int] = Body(..., examples=[[1, 2, 3]]), db=Depends(get_session)):
+    """
+    Delete many books by ID.
+    """
+    _check_bulk_size(ids)
+    try:
+        return await service.delete_books(db, ids)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "The whole catalog, streamed as NDJSON or CSV.",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        },
+        400: {"description": "Bad Request (Unsupported format)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def export_books(export_format: str = Query("ndjson", alias="format")):
+    """
+    Stream every book, ordered by ID, as NDJSON (one object per line) or CSV.
+    Rows are read from a server-side cursor, so memory use does not grow with the table.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query parameter 'format' must be one of: {', '.join(EXPORT_FORMATS)}."
+        )
+    return StreamingResponse(
+        service.export_books(export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="books.{export_format}"'},
+    )
+
+@router.post(
+    "/import",
+    response_model=ImportResponse,
+    responses={
+        200: {"description": "Import summary with per-row errors.", "model": ImportResponse},
+        400: {"description": "Bad Request (Unsupported format or batch size)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def import_books_stream(
+    request: Request,
+    import_format: str = Query("ndjson", alias="format"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE),
+    db=Depends(get_session),
+):
+    """
+    Import books from an NDJSON or CSV (with header row) request body.
+    The body is parsed as it arrives; rows are validated and committed every
+    `batch_size` rows, and progress is published as SSE events.
+    """
+    if import_format not in RECORD_PARSERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query parameter 'format' must be one of: {', '.join(RECORD_PARSERS)}."
+        )
+    if not 1 <= batch_size <= settings.IMPORT_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Query parameter 'batch_size' must be between 1 and {settings.IMPORT_MAX_BATCH_SIZE}."
+        )
+    try:
+        records = RECORD_PARSERS[import_format](request.stream())
+        return await import_books(service, db, records, batch_size)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+@router.get(
+    "/search",
+    response_model=SearchResponse,
+    responses={
+        200: {"description": "Matching books, best matches first.", "model": SearchResponse},
+        400: {"description": "Bad Request (Invalid query parameters)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def search_books(q: str, skip: int = 0, limit: int = 10, db=Depends(get_session)):
+    """
+    Full-text search over title, author and summary.
+
+    Every word of `q` must match (stemmed, so "running" finds "run"); end a
+    word with `*` to match it as a prefix. Results are ranked by relevance
+    and carry a snippet with the matches wrapped in `<mark>` tags.
     """
     if skip < 0 or limit < 1:
         raise HTTPException(
@@ -61,13 +355,10 @@ def get_books(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
             detail="Query parameters 'skip' must be >= 0 and 'limit' must be > 0."
         )
     try:
-        books, total = book_service.get_books(db, skip, limit)
-        return {
-            "items": books,
-            "total": total,
-            "skip": skip,
-            "limit": limit
-        }
+        books = await service.search_books(db, q, skip, limit)
+        return {"items": books, "skip": skip, "limit": limit}
+    except InvalidSearchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -76,28 +367,119 @@ def get_books(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
             detail="An internal server error occurred."
         )
 
+async def _lookup_batch(ids: List[int], fields: Optional[str], db) -> Response:
+    _check_bulk_size(ids)
+    projection = _parse_fields(fields)
+    try:
+        books, missing = await service.get_books_by_ids(db, tuple(ids), fields=projection)
+        return Response(content=batch_json(books, missing, projection), media_type="application/json")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail="An internal server error occurred."
+        )
+
+@router.get(
+    "/batch",
+    response_model=BatchResponse,
+    responses={
+        200: {"description": "Found books in request order, and the IDs with no book.", "model": BatchResponse},
+        400: {"description": "Bad Request (Malformed, empty or oversized ID list)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def get_books_batch(
+    ids: str = Query(..., description="Comma-separated book IDs, e.g. 3,1,42."),
+    fields: Optional[str] = None,
+    db=Depends(get_session),
+):
+    """
+    Retrieve many books by ID in one request.
+    Books come back in the order requested (each ID once); IDs with no book
+    are listed in `missing`. Use POST /batch for lists too long for a URL.
+    """
+    try:
+        book_ids = [int(book_id) for book_id in ids.split(",") if book_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Query parameter 'ids' must be comma-separated integers.")
+    return await _lookup_batch(book_ids, fields, db)
+
+@router.post(
+    "/batch",
+    response_model=BatchResponse,
+    responses={
+        200: {"description": "Found books in request order, and the IDs with no book.", "model": BatchResponse},
+        400: {"description": "Bad Request (Empty or oversized ID list)", "model": BadRequestError},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+        422: {"description": "Invalid input", "model": ValidationError},
+        500: {"description": "Internal Server Error", "model": InternalServerError},
+    },
+)
+async def post_books_batch(request: BatchRequest, fields: Optional[str] = None, db=Depends(get_session)):
+    """
+    Retrieve many books by ID, with the IDs in the request body.
+    Same results as GET /batch.
+    """
+    return await _lookup_batch(request.ids, fields, db)
+
+def _expected_version(if_match: Optional[str], book_id: int) -> Optional[int]:
+    try:
+        return if_match_version(if_match, book_id)
+    except ValueError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+
 @router.get(
     "/{book_id}",
     response_model=Book,
     responses={
         200: {"description": "Book retrieved successfully.", "model": Book},
+        304: {"description": "Not Modified (the If-None-Match ETag is current)"},
         400: {"description": "Bad Request (Invalid book ID)", "model": BadRequestError},
         401: {"description": "Unauthorized", "model": UnauthorizedError},
         404: {"description": "Book not found", "model": NotFoundError},
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def get_book(book_id: int, db: Session = Depends(get_db)):
+async def get_book(
+    book_id: int,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db=Depends(get_session),
+):
     """
     Retrieve a book by its ID.
+    Responses are served from an in-process cache of the serialized JSON.
+    `fields` (e.g. `title,author`) returns only those fields, plus `id`.
+    Send the `ETag` back as `If-None-Match` to get `304 Not Modified` while the book is unchanged.
     """
     if book_id <= 0:
         raise HTTPException(
             status_code=400,
             detail="Book ID must be a positive integer."
         )
+    projection = _parse_fields(fields)
     try:
-        return book_service.get_book(db, book_id)
+        cached = book_cache.get(book_id)
+        if cached is not None:
+            cached = project_response(cached, projection)
+        elif if_none_match:
+            # Revalidation only needs the version, not the whole row
+            version = await service.get_book_version(db, book_id)
+            if version is not None:
+                etag = book_etag(book_id, version, projection)
+                if none_match(if_none_match, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+        if cached is None:
+            # Passing the counter keeps a coalesced read from joining one that
+            # started before a write made by another worker
+            changes = await service.get_change_counter(db)
+            cached = await service.get_book_response(db, book_id, fields=projection, as_of=changes)
+        if none_match(if_none_match, cached.etag):
+            return Response(status_code=304, headers={"ETag": cached.etag})
+        return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -114,16 +496,27 @@ def get_book(book_id: int, db: Session = Depends(get_db)):
         400: {"description": "Bad Request (Malformed body or headers)", "model": BadRequestError},
         401: {"description": "Unauthorized", "model": UnauthorizedError},
         404: {"description": "Book not found", "model": NotFoundError},
+        412: {"description": "Precondition Failed (If-Match does not match the current ETag)", "model": PreconditionFailedError},
         422: {"description": "Invalid input", "model": ValidationError},
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def update_book(book_id: int, book: BookPut, db: Session = Depends(get_db)):
+async def update_book(
+    book_id: int,
+    book: BookPut,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db=Depends(get_session),
+):
     """
     Update an existing book.
+    With `If-Match`, the update only applies if the book still has that ETag.
     """
+    expected_version = _expected_version(if_match, book_id)
     try:
-        return book_service.update_book(db, book_id, book)
+        updated = await service.update_book(db, book_id, book, expected_version=expected_version)
+        response.headers["ETag"] = book_etag(updated.id, updated.version)
+        return updated
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -140,16 +533,27 @@ def update_book(book_id: int, book: BookPut, db: Session = Depends(get_db)):
         400: {"description": "Bad Request (Malformed body or headers)", "model": BadRequestError},
         401: {"description": "Unauthorized", "model": UnauthorizedError},
         404: {"description": "Book not found", "model": NotFoundError},
+        412: {"description": "Precondition Failed (If-Match does not match the current ETag)", "model": PreconditionFailedError},
         422: {"description": "Invalid input", "model": ValidationError},
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def update_book_partially(book_id: int, book_update: BookPatch, db: Session = Depends(get_db)):
+async def update_book_partially(
+    book_id: int,
+    book_update: BookPatch,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db=Depends(get_session),
+):
     """
     Partially update an existing book.
+    With `If-Match`, the update only applies if the book still has that ETag.
     """
+    expected_version = _expected_version(if_match, book_id)
     try:
-        return book_service.update_book_partially(db, book_id, book_update)
+        updated = await service.update_book_partially(db, book_id, book_update, expected_version=expected_version)
+        response.headers["ETag"] = book_etag(updated.id, updated.version)
+        return updated
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -166,20 +570,23 @@ def update_book_partially(book_id: int, book_update: BookPatch, db: Session = De
         400: {"description": "Bad Request (Invalid book ID)", "model": BadRequestError},
         401: {"description": "Unauthorized", "model": UnauthorizedError},
         404: {"description": "Book not found", "model": NotFoundError},
+        412: {"description": "Precondition Failed (If-Match does not match the current ETag)", "model": PreconditionFailedError},
         500: {"description": "Internal Server Error", "model": InternalServerError},
     },
 )
-def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, if_match: Optional[str] = Header(None), db=Depends(get_session)):
     """
     Delete a book by its ID.
+    With `If-Match`, the book is only deleted if it still has that ETag.
     """
     if book_id <= 0:
         raise HTTPException(
             status_code=400,
             detail="Book ID must be a positive integer."
         )
+    expected_version = _expected_version(if_match, book_id)
     try:
-        book_service.delete_book(db, book_id)
+        await service.delete_book(db, book_id, expected_version=expected_version)
         return {"message": "Book deleted successfully"}
     except HTTPException as e:
         raise e
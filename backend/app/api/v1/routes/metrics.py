@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from backend.app.core.metrics import collect_metrics
+from backend.app.core.security import verify_access_token
+from backend.app.db.schemas.errors import UnauthorizedError
+
+router = APIRouter(dependencies=[Depends(verify_access_token)])
+
+@router.get(
+    "/",
+    responses={
+        200: {"description": "Current counters reported by each registered subsystem."},
+        401: {"description": "Unauthorized", "model": UnauthorizedError},
+    },
+)
+async def get_metrics():
+    """
+    Snapshot of the in-process runtime counters.
+    """
+    return collect_metrics()
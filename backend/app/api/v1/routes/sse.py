@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi.responses import StreamingResponse
 from backend.app.core.sse import generate_stream, add_event
 from backend.app.core.security import verify_access_token
@@ -18,14 +19,20 @@ router = APIRouter(dependencies=[Depends(verify_access_token)])
         500: {"description": "Internal Server Error (Issue with the stream).", "model": InternalServerError},
     },
 )
-def stream_updates():
+async def stream_updates(last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")):
     """
     SSE endpoint for streaming real-time updates.
     Sends events whenever there is an update in the system.
+
+    Clients reconnecting with a `Last-Event-ID` header first receive the events
+    they missed, or a `resync-required` event if those are no longer buffered.
     """
+    if last_event_id is not None:
+        # An unparseable ID cannot be resumed from; 0 forces a resync
+        last_event_id = int(last_event_id) if last_event_id.strip().isdigit() else 0
     try:
         return StreamingResponse(
-            generate_stream(),
+            generate_stream(last_event_id),
             media_type="text/event-stream"
         )
     except Exception as e:
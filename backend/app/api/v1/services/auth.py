@@ -1,15 +1,23 @@
 from fastapi import HTTPException, status
-from backend.app.core.security import verify_password, create_access_token, hash_password
+from backend.app.core.security import verify_password, create_access_token
 from backend.app.core.sse import add_event  # Import the SSE event function
+from backend.app.core.config import settings
+from backend.app.core.executor import BoundedExecutor
+from backend.app.core.metrics import register_metrics
 
-# Mock user database
+# Mock user database; the hash is precomputed so importing this module does no bcrypt work
 fake_users_db = {
     "admin": {
         "username": "admin",
-        "hashed_password": hash_password("admin123"),  
+        "hashed_password": settings.ADMIN_PASSWORD_HASH,
     }
 }
 
+# bcrypt releases the GIL, so a few threads verify passwords in parallel
+# without blocking the event loop or the threadpool serving the book routes
+auth_executor = BoundedExecutor("auth", settings.AUTH_MAX_WORKERS, settings.AUTH_MAX_QUEUE)
+register_metrics("auth_executor", auth_executor.stats)
+
 def authenticate_user(username: str, password: str) -> str:
     """
     Authenticates a user and returns a JWT token.
@@ -1,21 +1,489 @@
+import csv
+import inspect
+import io
+import json
+import logging
+import threading
+import time
+from typing import List
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+from sqlalchemy import String, and_, bindparam, select, func, insert, update, delete, text, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.app.db.models import Book
-from backend.app.db.schemas.books import BookCreate, BookPut, BookPatch
+from starlette.concurrency import run_in_threadpool
+from backend.app.db.database import SessionLocal, AsyncSessionLocal
+from backend.app.db.models import Book, BooksMeta
+from backend.app.db.schemas.books import Book as BookSchema, BookCreate, BookPut, BookPatch, BookBulkPatch
 from fastapi import HTTPException, status
-from datetime import datetime, date
+from datetime import date
 from backend.app.core.sse import add_event
+from backend.app.core.pagination import encode_cursor, decode_cursor, InvalidCursorError
+from backend.app.core.search import match_expression
+from backend.app.core.config import settings
+from backend.app.core.cache import CachedResponse, ResponseCache, create_cache_backend
+from backend.app.core.etags import book_etag, projected_etag
+from backend.app.core.metrics import register_metrics
+from backend.app.core.singleflight import SingleFlight
+from backend.app.core.group_commit import GroupCommitter
+
+logger = logging.getLogger(__name__)
+
+# Columns a book listing can be ordered (and keyset-paginated) by.
+# Prefix a key with "-" to sort descending.
+SORT_KEYS = {
+    "id": Book.id,
+    "title": Book.title,
+    "author": Book.author,
+    "genre": Book.genre,
+    "published_date": Book.published_date,
+}
+SORT_OPTIONS = tuple(SORT_KEYS) + tuple(f"-{key}" for key in SORT_KEYS)
+
+
+def _sort_column(sort: str):
+    """
+    :return: Tuple of (column, descending) for a sort option.
+    """
+    return SORT_KEYS[sort.lstrip("-")], sort.startswith("-")
+
+
+def _keyset_ranges(column, descending: bool, value, last_id: int) -> list:
+    """
+    WHERE clauses selecting the rows strictly after (value, last_id) in
+    (column, id) order, as consecutive index ranges to read one after another.
+
+    SQLite sorts NULLs first, so on a nullable column an ascending page may
+    run from the NULLs into the non-NULL values, and a descending page from
+    the non-NULL values into the NULLs. Reading each range separately keeps
+    every read an index seek instead of an OR the planner can only scan.
+    """
+    if column is Book.id:
+        return [Book.id < last_id] if descending else [Book.id > last_id]
+    # Row-value comparisons seek straight into the (column, id) index
+    position = tuple_(column, Book.id)
+    if descending:
+        if value is None:
+            return [and_(column.is_(None), Book.id < last_id)]
+        ranges = [position < tuple_(value, last_id)]
+        if column.nullable:
+            ranges.append(column.is_(None))
+        return ranges
+    if value is None:
+        return [and_(column.is_(None), Book.id > last_id), column.is_not(None)]
+    return [position > tuple_(value, last_id)]
+
+
+def _filter_clauses(author: str = None, genre: str = None, published_from: date = None,
+                    published_to: date = None) -> list:
+    """
+    WHERE clauses for the listing filters; dates bound the range inclusively.
+    """
+    clauses = []
+    if author is not None:
+        clauses.append(Book.author == author)
+    if genre is not None:
+        clauses.append(Book.genre == genre)
+    if published_from is not None:
+        clauses.append(Book.published_date >= published_from)
+    if published_to is not None:
+        clauses.append(Book.published_date <= published_to)
+    return clauses
+
+
+# Fields of a book response, in response order
+BOOK_FIELDS = tuple(BookSchema.model_fields)
+
+
+def parse_fields(value: str = None):
+    """
+    Parse a `fields=` sparse fieldset: comma-separated book fields.
+
+    :return: The fields in response order, always including id, or None for
+        every field.
+    :raises ValueError: If a field is unknown.
+    """
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(BOOK_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Choose from: {', '.join(BOOK_FIELDS)}."
+        )
+    requested.add("id")
+    if len(requested) == len(BOOK_FIELDS):
+        return None
+    return tuple(field for field in BOOK_FIELDS if field in requested)
+
+
+def _projection(fields: tuple = None, *extra: str) -> list:
+    """
+    Columns to select for `fields` (all response fields if None), plus any
+    `extra` ones the query needs itself, such as the sort key.
+    """
+    names = list(fields or BOOK_FIELDS)
+    names += [name for name in extra if name not in names]
+    return [Book.__table__.c[name] for name in names]
+
+
+def _row_fields(row, fields: tuple = None) -> dict:
+    if fields is None:
+        return row._asdict()  # selected through _projection(None): exactly BOOK_FIELDS
+    return {field: getattr(row, field) for field in fields}
+
+
+def page_json(books: list, total, skip: int, limit: int, next_cursor, fields: tuple = None) -> bytes:
+    """
+    Serialize a page of listing rows as a BooksResponse body, trimmed to `fields`.
+
+    The rows come straight from the database through the columns of
+    `_projection`, so they already match the Book schema; they are encoded
+    as-is instead of being validated into models first.
+    """
+    return to_json({
+        "items": [_row_fields(book, fields) for book in books],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    })
+
+
+def _list_statements(skip: int, cursor: str, sort: str, filters: list = (), fields: tuple = None) -> list:
+    """
+    Build the SELECTs for one page of books, to be run in order (each limited
+    to the rows still missing) until the page plus one look-ahead row is full.
+    Only the columns of `fields` (plus the sort key) are selected.
+    """
+    column, descending = _sort_column(sort)
+    columns = _projection(fields, column.key)
+    if descending:
+        statement = select(*columns).order_by(column.desc(), Book.id.desc())
+    else:
+        statement = select(*columns).order_by(column, Book.id)
+    statement = statement.where(*filters)
+    if not cursor:
+        return [statement.offset(skip)]
+    value, last_id = decode_cursor(cursor, sort)
+    if column is Book.published_date and value is not None:
+        try:
+            value = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursorError("Malformed cursor.")
+    return [statement.where(clause) for clause in _keyset_ranges(column, descending, value, last_id)]
+
+
+def _count_statement(filters: list):
+    return select(func.count()).select_from(Book).where(*filters)
+
+
+def _finish_page(books: list, limit: int, sort: str):
+    """
+    Trim the look-ahead row from a page and compute its next cursor.
+    """
+    next_cursor = None
+    if len(books) > limit:
+        books = books[:limit]
+        last = books[-1]
+        column, _ = _sort_column(sort)
+        next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+    return books, next_cursor
+
+
+def _changes(book, exclude_unset: bool = True) -> dict:
+    """
+    Column values to write for a create/update payload.
+    """
+    return book.dict(exclude_unset=exclude_unset)
+
+
+def _not_found(book_id: int) -> HTTPException:
+    add_event(
+        event_type="error",
+        message=f"Book with ID {book_id} not found",
+        data={"id": book_id},
+    )
+    return HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
+
+
+def _update_statement(book_id: int, changes: dict, expected_version: int = None):
+    """
+    One statement that applies `changes` to a book (bumping its version) and
+    returns the updated row; no row comes back if the book is missing or,
+    given `expected_version`, has moved on. With no changes it only reads the row.
+    """
+    table = Book.__table__
+    criteria = [table.c.id == book_id]
+    if expected_version is not None:
+        criteria.append(table.c.version == expected_version)
+    if not changes:
+        return select(*table.c).where(*criteria)
+    return update(table).where(*criteria).values(version=table.c.version + 1, **changes).returning(*table.c)
+
+
+def _delete_statement(book_id: int, expected_version: int = None):
+    table = Book.__table__
+    statement = delete(table).where(table.c.id == book_id)
+    if expected_version is not None:
+        statement = statement.where(table.c.version == expected_version)
+    return statement.returning(table.c.id)
+
+
+# Event type and message of each kind of batched single-book write
+_BATCHED_WRITE_EVENTS = {
+    "create": ("book-created", "Book created"),
+    "update": ("book-updated", "Book updated"),
+    "update_partially": ("book-partially-updated", "Book partially updated"),
+}
+
+
+def _write_missed(book_id: int, expected_version: int, current_version) -> HTTPException:
+    """
+    Explain a write that matched no row: the book is gone, or it no longer
+    has the version the client's If-Match named.
+    """
+    if expected_version is None or current_version is None:
+        return _not_found(book_id)
+    return HTTPException(
+        status.HTTP_412_PRECONDITION_FAILED, detail=f"Book with ID {book_id} has been modified."
+    )
+
+
+_COUNT_STATEMENT = select(BooksMeta.value).where(BooksMeta.key == "book_count")
+_CHANGES_STATEMENT = select(BooksMeta.value).where(BooksMeta.key == "books_changes")
+_VERSION_STATEMENT = select(Book.version).where(Book.id == bindparam("book_id"))
+
+_BOOK_CREATE_ADAPTER = TypeAdapter(BookCreate)
+_BOOK_BULK_PATCH_ADAPTER = TypeAdapter(BookBulkPatch)
+# Multi-row INSERT ... RETURNING, with the ids handed back in parameter-row order.
+_BULK_INSERT = insert(Book.__table__).returning(Book.__table__.c.id, sort_by_parameter_order=True)
+
+# Ranked full-text matches. bm25 weighs title hits above author hits above
+# summary hits; it returns lower-is-better scores, so they are negated.
+_SEARCH_STATEMENT = text("""
+    SELECT books.id, books.title, books.author, books.published_date, books.summary, books.genre,
+           -bm25(books_fts, 10.0, 5.0, 1.0) AS score,
+           snippet(books_fts, -1, '<mark>', '</mark>', '…', 16) AS snippet
+    FROM books_fts JOIN books ON books.id = books_fts.rowid
+    WHERE books_fts MATCH :query
+    ORDER BY bm25(books_fts, 10.0, 5.0, 1.0), books.id
+    LIMIT :limit OFFSET :skip
+""")
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Dates are exported exactly as stored (ISO text), skipping the round trip through date objects
+_EXPORT_COLUMNS = (
+    Book.id, Book.title, Book.author, type_coerce(Book.published_date, String).label("published_date"),
+    Book.summary, Book.genre,
+)
+# Plain column tuples (no ORM identity map) streamed from a server-side cursor
+_EXPORT_STATEMENT = select(*_EXPORT_COLUMNS).order_by(Book.id)
+
+
+def _export_header(export_format: str) -> str:
+    if export_format == "csv":
+        return _format_export_rows([[column.key for column in _EXPORT_COLUMNS]], "csv")
+    return ""
+
+
+def _format_export_rows(rows, export_format: str) -> str:
+    """
+    Render one batch of export rows as a single text chunk.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    keys = [column.key for column in _EXPORT_COLUMNS]
+    return "".join(json.dumps(dict(zip(keys, row)), default=str) + "\n" for row in rows)
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _batch_statements(ids: list, fields: tuple = None):
+    """
+    SELECTs fetching the books of `ids`, at most BATCH_LOOKUP_CHUNK_SIZE IDs per IN list.
+    """
+    columns = _projection(fields)
+    for chunk in _chunks(ids, settings.BATCH_LOOKUP_CHUNK_SIZE):
+        yield select(*columns).where(Book.id.in_(chunk))
+
+
+def batch_json(books: list, missing: list, fields: tuple = None) -> bytes:
+    """
+    Serialize a batch lookup as a BatchResponse body, trimmed to `fields`.
+    """
+    return to_json({"items": [_row_fields(book, fields) for book in books], "missing": missing})
+
+
+def _validate_bulk(items: list, adapter: TypeAdapter):
+    """
+    Validate every item of a bulk payload in one pass.
+    :return: Tuple of (results with an entry for each invalid item, list of (index, model)).
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, adapter.validate_python(item)))
+        except ValidationError as e:
+            results[index] = {
+                "index": index,
+                "status": "invalid",
+                "errors": e.errors(include_url=False, include_context=False, include_input=False),
+            }
+    return results, valid
+
+
+def _item_failed(index: int, book_id: int = None) -> dict:
+    # The database error stays in the server log; it can carry SQL and values
+    result = {"index": index, "status": "error", "detail": "The book could not be written"}
+    if book_id is not None:
+        result["id"] = book_id
+    return result
+
+
+def _chunk_failed(results: list, chunk: list, error: Exception, book_id=lambda item: None):
+    logger.warning("Bulk write of %d books failed: %s", len(chunk), error)
+    for index, item in chunk:
+        if results[index] is None:
+            results[index] = _item_failed(index, book_id(item))
+
+
+def _bulk_summary(results: list, status_ok: str) -> dict:
+    succeeded = sum(1 for result in results if result["status"] == status_ok)
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+
+class BookCountCache:
+    """
+    In-process copy of the trigger-maintained row count in `books_meta`.
+
+    Writes in this process adjust the copy after they commit; writes from
+    other processes are picked up once the copy is older than the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded_at = 0.0
+
+    def _cached(self):
+        with self._lock:
+            if self._value is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return self._value
+        return None
+
+    def _store(self, value: int) -> int:
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.monotonic()
+        return value
+
+    def get(self, db: Session) -> int:
+        value = self._cached()
+        if value is not None:
+            return value
+        value = db.execute(_COUNT_STATEMENT).scalar()
+        if value is None:
+            # Counter not initialized yet; fall back to a full count
+            value = db.execute(select(func.count()).select_from(Book)).scalar()
+        return self._store(value)
+
+    async def get_async(self, db: AsyncSession) -> int:
+        value = self._cached()
+        if value is not None:
+            return value
+        value = (await db.execute(_COUNT_STATEMENT)).scalar()
+        if value is None:
+            value = (await db.execute(select(func.count()).select_from(Book))).scalar()
+        return self._store(value)
+
+    def adjust(self, delta: int):
+        with self._lock:
+            if self._value is not None:
+                self._value += delta
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+
+book_count = BookCountCache(settings.BOOK_COUNT_CACHE_TTL_SECONDS)
+
+# GET /v1/books/{id} response bodies by book ID. Writes in this process
+# invalidate their rows right after committing.
+book_cache = ResponseCache(create_cache_backend(
+    settings.BOOK_CACHE_BACKEND,
+    max_entries=settings.BOOK_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BOOK_CACHE_TTL_SECONDS,
+))
+register_metrics("book_cache", book_cache.stats)
+
+_BOOK_ADAPTER = TypeAdapter(BookSchema)
+
+
+def _book_response(book: Book) -> CachedResponse:
+    model = _BOOK_ADAPTER.validate_python(book, from_attributes=True)
+    return CachedResponse(book_etag(book.id, book.version), _BOOK_ADAPTER.dump_json(model), model.model_dump())
+
+
+def project_response(response: CachedResponse, fields: tuple = None) -> CachedResponse:
+    """
+    Trim a full (cached) book response to a sparse fieldset.
+    """
+    if fields is None:
+        return response
+    return CachedResponse(
+        projected_etag(response.etag, fields), to_json({field: response.data[field] for field in fields})
+    )
+
+
+def _projected_book_statement(book_id: int, fields: tuple):
+    return select(*_projection(fields, "version")).where(Book.id == book_id)
+
+
+def _projected_book_response(book_id: int, row, fields: tuple) -> CachedResponse:
+    if row is None:
+        raise _not_found(book_id)
+    return CachedResponse(book_etag(book_id, row.version, fields), to_json(_row_fields(row, fields)))
+
+
+def _begin_for_savepoints(db: Session):
+    """
+    Open the write transaction explicitly. pysqlite only begins one on DML, so
+    without this each savepoint would run (and commit) as its own transaction.
+    """
+    db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _bulk_update_statement(fields: tuple):
+    """
+    Core UPDATE by primary key for executemany over rows setting `fields`.
+    Bumps the row version like the single-book update statements do.
+    """
+    table = Book.__table__
+    values = {field: bindparam(field) for field in fields if field != "book_id"}
+    return (
+        update(table)
+        .where(table.c.id == bindparam("book_id"))
+        .values(version=table.c.version + 1, **values)
+    )
 
-DATE_FORMAT = "%Y-%m-%d"
 
 class BookService:
     def create_book(self, db: Session, book: BookCreate):
-        book_data = book.dict()
-        if book.published_date:
-            book_data["published_date"] = book.published_date.strftime(DATE_FORMAT)
         try:
-            db_book = Book(**book_data)
+            db_book = Book(**_changes(book))
             db.add(db_book)
             db.commit()
+            book_count.adjust(1)
             db.refresh(db_book)
             add_event(
                 event_type="book-created",
@@ -34,27 +502,67 @@ class BookService:
         finally:
             db.close()  
 
-    def get_books(self, db: Session, skip: int, limit: int):
-        books = db.query(Book).offset(skip).limit(limit).all()
-        total = db.query(Book).count()
-        for book in books:
-            if book.published_date:
-                book.published_date = datetime.strptime(book.published_date, DATE_FORMAT).date()
-        return books, total
+    def get_books(self, db: Session, skip: int, limit: int, cursor: str = None, sort: str = "id",
+                  include_total: bool = True, author: str = None, genre: str = None,
+                  published_from: date = None, published_to: date = None, fields: tuple = None,
+                  as_of: int = None):
+        """
+        Retrieve a page of books, optionally filtered and trimmed to `fields`.
+
+        When a cursor is given the page starts right after the row it points
+        at (keyset pagination), so every page costs the same regardless of
+        depth. Otherwise `skip` rows are skipped with OFFSET.
+
+        :param sort: One of SORT_OPTIONS; ties are broken by ID.
+        :param as_of: The change counter the caller read first. Unused by the
+            query; it keys coalesced reads (see CoalescingBookService).
+        :return: Tuple of (books, total, next_cursor). `total` counts the
+            matching books and is None unless `include_total` is set;
+            `next_cursor` is None on the last page.
+        :raises InvalidCursorError: If the cursor is malformed.
+        """
+        filters = _filter_clauses(author, genre, published_from, published_to)
+        rows = []
+        for statement in _list_statements(skip, cursor, sort, filters, fields):
+            rows.extend(db.execute(statement.limit(limit + 1 - len(rows))))
+            if len(rows) > limit:
+                break
+        books, next_cursor = _finish_page(rows, limit, sort)
+        total = None
+        if include_total:
+            total = db.execute(_count_statement(filters)).scalar() if filters else book_count.get(db)
+        return books, total, next_cursor
+
+    def get_books_by_ids(self, db: Session, ids: tuple, fields: tuple = None):
+        """
+        Fetch many books by ID with chunked IN queries.
+
+        :return: Tuple of (books in the order of `ids`, each ID once; IDs with
+            no book, in request order).
+        """
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for statement in _batch_statements(ids, fields):
+            found.update((row.id, row) for row in db.execute(statement))
+        return [found[book_id] for book_id in ids if book_id in found], [book_id for book_id in ids if book_id not in found]
+
+    def search_books(self, db: Session, query: str, skip: int, limit: int):
+        """
+        Full-text search over title, author and summary, best matches first.
+        :return: Matching rows with their relevance score and a highlighted snippet.
+        :raises InvalidSearchError: If the query has no searchable words.
+        """
+        params = {"query": match_expression(query), "skip": skip, "limit": limit}
+        return db.execute(_SEARCH_STATEMENT, params).mappings().all()
 
     def get_book(self, db: Session, book_id: int):
         try:
             book = db.query(Book).filter(Book.id == book_id).first()
             if not book:
-                add_event(
-                    event_type="error",
-                    message=f"Book with ID {book_id} not found",
-                    data={"id": book_id},
-                )
-                raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
-            if book.published_date:
-                book.published_date = datetime.strptime(book.published_date, DATE_FORMAT).date()
+                raise _not_found(book_id)
             return book
+        except HTTPException:
+            raise
         except Exception as e:
             add_event(
                 event_type="error",
@@ -63,28 +571,50 @@ class BookService:
             )
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-    def update_book(self, db: Session, book_id: int, book: BookPut):
-        db_book = db.query(Book).filter(Book.id == book_id).first()
-        if not db_book:
-            add_event(
-                event_type="error",
-                message=f"Book with ID {book_id} not found",
-                data={"id": book_id},
-            )
-            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
+    def get_book_response(self, db: Session, book_id: int, fields: tuple = None,
+                          as_of: int = None) -> CachedResponse:
+        """
+        Load a book, serialize it as the GET response body and cache it with its ETag.
+        Callers check `book_cache` first; this is the miss path. A sparse
+        fieldset selects only its columns and is not cached (projections of
+        cached books are cut from the full entry instead).
+        :param as_of: As for `get_books`.
+        """
+        if fields is not None:
+            return _projected_book_response(book_id, db.execute(_projected_book_statement(book_id, fields)).first(), fields)
+        generation = book_cache.generation
+        response = _book_response(self.get_book(db, book_id))
+        book_cache.fill(book_id, response, generation)
+        return response
+
+    def get_book_version(self, db: Session, book_id: int):
+        """
+        :return: The book's row version, or None if it does not exist.
+        """
+        return db.execute(_VERSION_STATEMENT, {"book_id": book_id}).scalar()
+
+    def get_change_counter(self, db: Session) -> int:
+        """
+        :return: Number of writes ever made to the books table.
+        """
+        return db.execute(_CHANGES_STATEMENT).scalar() or 0
+
+    def update_book(self, db: Session, book_id: int, book: BookPut, expected_version: int = None):
         try:
-            for key, value in book.dict(exclude_unset=True).items():
-                if key == "published_date" and isinstance(value, date):
-                    value = value.strftime(DATE_FORMAT)
-                setattr(db_book, key, value)
+            db_book = db.execute(_update_statement(book_id, _changes(book), expected_version)).first()
+            if db_book is None:
+                db.rollback()
+                raise _write_missed(book_id, expected_version, self.get_book_version(db, book_id))
             db.commit()
-            db.refresh(db_book)
+            book_cache.invalidate(book_id)
             add_event(
                 event_type="book-updated",
                 message=f"Book updated: {db_book.title}",
                 data={"id": db_book.id, "title": db_book.title, "author": db_book.author},
             )
             return db_book
+        except HTTPException:
+            raise
         except Exception as e:
             db.rollback()
             add_event(
@@ -96,28 +626,22 @@ class BookService:
         finally:
             db.close() 
 
-    def update_book_partially(self, db: Session, book_id: int, book: BookPatch):
-        db_book = db.query(Book).filter(Book.id == book_id).first()
-        if not db_book:
-            add_event(
-                event_type="error",
-                message=f"Book with ID {book_id} not found",
-                data={"id": book_id},
-            )
-            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
+    def update_book_partially(self, db: Session, book_id: int, book: BookPatch, expected_version: int = None):
         try:
-            for key, value in book.dict(exclude_unset=True).items():
-                if key == "published_date" and isinstance(value, date):
-                    value = value.strftime(DATE_FORMAT)
-                setattr(db_book, key, value)
+            db_book = db.execute(_update_statement(book_id, _changes(book), expected_version)).first()
+            if db_book is None:
+                db.rollback()
+                raise _write_missed(book_id, expected_version, self.get_book_version(db, book_id))
             db.commit()
-            db.refresh(db_book)
+            book_cache.invalidate(book_id)
             add_event(
                 event_type="book-partially-updated",
                 message=f"Book partially updated: {db_book.title}",
                 data={"id": db_book.id, "title": db_book.title},
             )
             return db_book
+        except HTTPException:
+            raise
         except Exception as e:
             db.rollback()
             add_event(
@@ -129,34 +653,629 @@ class BookService:
         finally:
             db.close() 
 
-    def delete_book(self, db: Session, book_id: int):
-        db_book = db.query(Book).filter(Book.id == book_id).first()
-        if not db_book:
+    def delete_book(self, db: Session, book_id: int, expected_version: int = None):
+        try:
+            if db.execute(_delete_statement(book_id, expected_version)).first() is None:
+                db.rollback()
+                raise _write_missed(book_id, expected_version, self.get_book_version(db, book_id))
+            db.commit()
+            book_count.adjust(-1)
+            book_cache.invalidate(book_id)
             add_event(
-                event_type="error",
-                message=f"Book with ID {book_id} not found",
+                event_type="book-deleted",
+                message=f"Book deleted with ID {book_id}",
                 data={"id": book_id},
             )
-            raise HTTPException(status.HTTP_404_NOT_FOUND, detail=f"Book with ID {book_id} not found")
+            return {"detail": "Book deleted"}
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.rollback()
+            add_event(
+                event_type="error",
+                message=f"Failed to delete book with ID {book_id}",
+                data={"id": book_id, "error": str(e)},
+            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        finally:
+            db.close() 
+
+    def write_batch(self, db: Session, writes: list) -> list:
+        """
+        Apply many single-book writes in one transaction (group commit), each
+        in its own savepoint so a failing write is rolled back alone.
+
+        :param writes: (kind, book_id, book, expected_version) tuples, where kind
+            is "create", "update" or "update_partially".
+        :return: Per write, the written row or the HTTPException to raise for it.
+        """
+        table = Book.__table__
+        outcomes = []
         try:
-            db.delete(db_book)
+            _begin_for_savepoints(db)
+            for kind, book_id, book, expected_version in writes:
+                savepoint = db.begin_nested()
+                try:
+                    if kind == "create":
+                        row = db.execute(insert(table).values(**_changes(book)).returning(*table.c)).first()
+                    else:
+                        row = db.execute(_update_statement(book_id, _changes(book), expected_version)).first()
+                        if row is None:
+                            raise _write_missed(book_id, expected_version, self.get_book_version(db, book_id))
+                    savepoint.commit()
+                    outcomes.append(row)
+                except HTTPException as e:
+                    savepoint.rollback()
+                    outcomes.append(e)
+                except Exception as e:
+                    savepoint.rollback()
+                    add_event(
+                        event_type="error",
+                        message=f"Failed to write book with ID {book_id}" if book_id else "Failed to create book",
+                        data={"id": book_id, "error": str(e)},
+                    )
+                    outcomes.append(HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)))
             db.commit()
+        except Exception as e:
+            db.rollback()
+            add_event(
+                event_type="error",
+                message=f"Failed to commit a batch of {len(writes)} book writes",
+                data={"error": str(e)},
+            )
+            return [HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))] * len(writes)
+        finally:
+            db.close()
+
+        created, updated = 0, []
+        for (kind, book_id, _, _), row in zip(writes, outcomes):
+            if isinstance(row, HTTPException):
+                continue
+            event_type, message = _BATCHED_WRITE_EVENTS[kind]
+            data = {"id": row.id, "title": row.title}
+            if kind == "create":
+                created += 1
+            else:
+                updated.append(row.id)
+            if kind != "update_partially":
+                data["author"] = row.author
+            add_event(event_type=event_type, message=f"{message}: {row.title}", data=data)
+        if created:
+            book_count.adjust(created)
+        if updated:
+            book_cache.invalidate(*updated)
+        return outcomes
+
+    def _insert_books(self, db: Session, valid: list, results: list, chunk_size: int) -> list:
+        """
+        Insert validated books, committing every `chunk_size` rows.
+        Fills `results` for every item and returns the created IDs.
+        """
+        created = []
+        for chunk in _chunks(valid, chunk_size):
+            try:
+                rows = [_changes(book, exclude_unset=False) for _, book in chunk]
+                ids = db.execute(_BULK_INSERT, rows).scalars().all()
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                _chunk_failed(results, chunk, e)
+                continue
+            for (index, _), book_id in zip(chunk, ids):
+                results[index] = {"index": index, "status": "created", "id": book_id}
+            created.extend(ids)
+        book_count.adjust(len(created))
+        return created
+
+    def create_books(self, db: Session, items: List[dict]):
+        """
+        Validate and insert many books, one transaction per chunk.
+        :return: Per-item outcomes plus success/failure counts.
+        """
+        results, valid = _validate_bulk(items, _BOOK_CREATE_ADAPTER)
+        created = self._insert_books(db, valid, results, settings.BULK_CHUNK_SIZE)
+        if created:
+            add_event(
+                event_type="books-bulk-created",
+                message=f"{len(created)} books created",
+                data={"count": len(created), "ids": created},
+            )
+        return _bulk_summary(results, "created")
+
+    def import_batch(self, db: Session, items: List[dict]):
+        """
+        Validate one batch of imported rows and insert the valid ones in a single transaction.
+        :return: Per-item outcomes, in batch order.
+        """
+        results, valid = _validate_bulk(items, _BOOK_CREATE_ADAPTER)
+        self._insert_books(db, valid, results, max(len(valid), 1))
+        return results
+
+    def _update_group(self, db: Session, fields: tuple, group: list, results: list):
+        """
+        Write one group of patches setting the same fields with one executemany
+        in a savepoint. If it fails, retry the rows one by one so only the
+        failing ones are reported as errors.
+        """
+        statement = _bulk_update_statement(fields)
+        try:
+            with db.begin_nested():
+                db.execute(statement, [values for _, values in group])
+            return
+        except Exception as e:
+            logger.warning("Bulk update of %d books failed, retrying row by row: %s", len(group), e)
+        for index, values in group:
+            try:
+                with db.begin_nested():
+                    db.execute(statement, [values])
+            except Exception as e:
+                logger.warning("Bulk update of book %s failed: %s", values["book_id"], e)
+                results[index] = _item_failed(index, values["book_id"])
+
+    def update_books(self, db: Session, items: List[dict]):
+        """
+        Validate and partially update many books by ID, one transaction per chunk.
+        Rows changing the same set of fields are written with one executemany.
+        """
+        results, valid = _validate_bulk(items, _BOOK_BULK_PATCH_ADAPTER)
+        updated = []
+        for chunk in _chunks(valid, settings.BULK_CHUNK_SIZE):
+            try:
+                _begin_for_savepoints(db)
+                requested = {patch.id for _, patch in chunk}
+                existing = set(db.execute(select(Book.id).where(Book.id.in_(requested))).scalars())
+                by_fields = {}
+                for index, patch in chunk:
+                    if patch.id not in existing:
+                        results[index] = {"index": index, "status": "not_found", "id": patch.id}
+                        continue
+                    values = _changes(patch)
+                    values["book_id"] = values.pop("id")
+                    by_fields.setdefault(tuple(sorted(values)), []).append((index, values))
+                for fields, group in by_fields.items():
+                    if len(fields) > 1:
+                        self._update_group(db, fields, group, results)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                _chunk_failed(results, chunk, e, lambda patch: patch.id)
+                continue
+            book_cache.invalidate(*existing)
+            for index, patch in chunk:
+                if results[index] is None:
+                    results[index] = {"index": index, "status": "updated", "id": patch.id}
+                    updated.append(patch.id)
+        if updated:
+            add_event(
+                event_type="books-bulk-updated",
+                message=f"{len(updated)} books updated",
+                data={"count": len(updated), "ids": updated},
+            )
+        return _bulk_summary(results, "updated")
+
+    def delete_books(self, db: Session, ids: List[int]):
+        """
+        Delete many books by ID with one DELETE ... RETURNING per chunk.
+        Repeats of an ID are reported as "duplicate" and not counted again.
+        """
+        results = [None] * len(ids)
+        first = {}
+        for index, book_id in enumerate(ids):
+            if first.setdefault(book_id, index) != index:
+                results[index] = {"index": index, "status": "duplicate", "id": book_id}
+        deleted = []
+        for chunk in _chunks([(index, book_id) for book_id, index in first.items()], settings.BULK_CHUNK_SIZE):
+            try:
+                statement = (
+                    delete(Book)
+                    .where(Book.id.in_({book_id for _, book_id in chunk}))
+                    .returning(Book.id)
+                    .execution_options(synchronize_session=False)
+                )
+                gone = set(db.execute(statement).scalars())
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                _chunk_failed(results, chunk, e, lambda book_id: book_id)
+                continue
+            book_cache.invalidate(*gone)
+            for index, book_id in chunk:
+                outcome = "deleted" if book_id in gone else "not_found"
+                results[index] = {"index": index, "status": outcome, "id": book_id}
+            deleted.extend(sorted(gone))
+        if deleted:
+            book_count.adjust(-len(deleted))
+            add_event(
+                event_type="books-bulk-deleted",
+                message=f"{len(deleted)} books deleted",
+                data={"count": len(deleted), "ids": deleted},
+            )
+        return _bulk_summary(results, "deleted")
+
+    def export_books(self, export_format: str):
+        """
+        Stream the whole catalog as NDJSON or CSV text chunks.
+
+        Rows are fetched EXPORT_BATCH_SIZE at a time from a server-side
+        cursor in a session owned by the generator, so memory stays flat
+        whatever the table size.
+        """
+        db = SessionLocal()
+        try:
+            header = _export_header(export_format)
+            if header:
+                yield header
+            result = db.execute(_EXPORT_STATEMENT.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            for rows in result.partitions():
+                yield _format_export_rows(rows, export_format)
+        finally:
+            db.close()
+
+
+class AsyncBookService:
+    """
+    AsyncSession-based counterpart of BookService with the same behavior and events.
+    Database I/O is awaited, so no threadpool thread is held while SQLite works.
+    """
+
+    async def create_book(self, db: AsyncSession, book: BookCreate):
+        try:
+            db_book = Book(**_changes(book))
+            db.add(db_book)
+            await db.commit()
+            book_count.adjust(1)
+            await db.refresh(db_book)
+            add_event(
+                event_type="book-created",
+                message=f"Book created: {db_book.title}",
+                data={"id": db_book.id, "title": db_book.title, "author": db_book.author},
+            )
+            return db_book
+        except Exception as e:
+            await db.rollback()
+            add_event(
+                event_type="error",
+                message="Failed to create book",
+                data={"error": str(e)},
+            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def get_books(self, db: AsyncSession, skip: int, limit: int, cursor: str = None, sort: str = "id",
+                        include_total: bool = True, author: str = None, genre: str = None,
+                        published_from: date = None, published_to: date = None, fields: tuple = None,
+                        as_of: int = None):
+        filters = _filter_clauses(author, genre, published_from, published_to)
+        rows = []
+        for statement in _list_statements(skip, cursor, sort, filters, fields):
+            rows.extend(await db.execute(statement.limit(limit + 1 - len(rows))))
+            if len(rows) > limit:
+                break
+        books, next_cursor = _finish_page(rows, limit, sort)
+        total = None
+        if include_total:
+            if filters:
+                total = (await db.execute(_count_statement(filters))).scalar()
+            else:
+                total = await book_count.get_async(db)
+        return books, total, next_cursor
+
+    async def get_books_by_ids(self, db: AsyncSession, ids: tuple, fields: tuple = None):
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for statement in _batch_statements(ids, fields):
+            found.update((row.id, row) for row in await db.execute(statement))
+        return [found[book_id] for book_id in ids if book_id in found], [book_id for book_id in ids if book_id not in found]
+
+    async def search_books(self, db: AsyncSession, query: str, skip: int, limit: int):
+        params = {"query": match_expression(query), "skip": skip, "limit": limit}
+        return (await db.execute(_SEARCH_STATEMENT, params)).mappings().all()
+
+    async def get_book(self, db: AsyncSession, book_id: int):
+        try:
+            book = await db.get(Book, book_id)
+            if not book:
+                raise _not_found(book_id)
+            return book
+        except HTTPException:
+            raise
+        except Exception as e:
+            add_event(
+                event_type="error",
+                message=f"Error retrieving book with ID {book_id}",
+                data={"id": book_id, "error": str(e)},
+            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def get_book_response(self, db: AsyncSession, book_id: int, fields: tuple = None,
+                                as_of: int = None) -> CachedResponse:
+        if fields is not None:
+            row = (await db.execute(_projected_book_statement(book_id, fields))).first()
+            return _projected_book_response(book_id, row, fields)
+        generation = book_cache.generation
+        response = _book_response(await self.get_book(db, book_id))
+        book_cache.fill(book_id, response, generation)
+        return response
+
+    async def get_book_version(self, db: AsyncSession, book_id: int):
+        return (await db.execute(_VERSION_STATEMENT, {"book_id": book_id})).scalar()
+
+    async def get_change_counter(self, db: AsyncSession) -> int:
+        return (await db.execute(_CHANGES_STATEMENT)).scalar() or 0
+
+    async def update_book(self, db: AsyncSession, book_id: int, book: BookPut, expected_version: int = None):
+        try:
+            db_book = (await db.execute(_update_statement(book_id, _changes(book), expected_version))).first()
+            if db_book is None:
+                await db.rollback()
+                raise _write_missed(book_id, expected_version, await self.get_book_version(db, book_id))
+            await db.commit()
+            book_cache.invalidate(book_id)
+            add_event(
+                event_type="book-updated",
+                message=f"Book updated: {db_book.title}",
+                data={"id": db_book.id, "title": db_book.title, "author": db_book.author},
+            )
+            return db_book
+        except HTTPException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            add_event(
+                event_type="error",
+                message=f"Failed to update book with ID {book_id}",
+                data={"id": book_id, "error": str(e)},
+            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def update_book_partially(self, db: AsyncSession, book_id: int, book: BookPatch, expected_version: int = None):
+        try:
+            db_book = (await db.execute(_update_statement(book_id, _changes(book), expected_version))).first()
+            if db_book is None:
+                await db.rollback()
+                raise _write_missed(book_id, expected_version, await self.get_book_version(db, book_id))
+            await db.commit()
+            book_cache.invalidate(book_id)
+            add_event(
+                event_type="book-partially-updated",
+                message=f"Book partially updated: {db_book.title}",
+                data={"id": db_book.id, "title": db_book.title},
+            )
+            return db_book
+        except HTTPException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            add_event(
+                event_type="error",
+                message=f"Failed to partially update book with ID {book_id}",
+                data={"id": book_id, "error": str(e)},
+            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def delete_book(self, db: AsyncSession, book_id: int, expected_version: int = None):
+        try:
+            if (await db.execute(_delete_statement(book_id, expected_version))).first() is None:
+                await db.rollback()
+                raise _write_missed(book_id, expected_version, await self.get_book_version(db, book_id))
+            await db.commit()
+            book_count.adjust(-1)
+            book_cache.invalidate(book_id)
             add_event(
                 event_type="book-deleted",
                 message=f"Book deleted with ID {book_id}",
                 data={"id": book_id},
             )
             return {"detail": "Book deleted"}
+        except HTTPException:
+            raise
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             add_event(
                 event_type="error",
                 message=f"Failed to delete book with ID {book_id}",
                 data={"id": book_id, "error": str(e)},
             )
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    # The bulk paths are chunked loops of set-based statements; they reuse the
+    # sync implementation through run_sync, which still awaits aiosqlite for I/O.
+    async def create_books(self, db: AsyncSession, items: List[dict]):
+        return await db.run_sync(book_service.create_books, items)
+
+    async def update_books(self, db: AsyncSession, items: List[dict]):
+        return await db.run_sync(book_service.update_books, items)
+
+    async def delete_books(self, db: AsyncSession, ids: List[int]):
+        return await db.run_sync(book_service.delete_books, ids)
+
+    async def import_batch(self, db: AsyncSession, items: List[dict]):
+        return await db.run_sync(book_service.import_batch, items)
+
+    async def export_books(self, export_format: str):
+        """
+        Async counterpart of BookService.export_books using AsyncSession.stream.
+        """
+        async with AsyncSessionLocal() as db:
+            header = _export_header(export_format)
+            if header:
+                yield header
+            result = await db.stream(_EXPORT_STATEMENT.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                yield _format_export_rows(rows, export_format)
+
+
+class ThreadedBookService:
+    """
+    Awaitable facade over a BookService: every call runs in the threadpool.
+    Lets the async routes serve the sync database path unchanged. Generator
+    methods are returned as-is; StreamingResponse iterates them in the threadpool.
+    """
+
+    def __init__(self, service: BookService):
+        self._service = service
+
+    def __getattr__(self, name):
+        method = getattr(self._service, name)
+        if inspect.isgeneratorfunction(method):
+            return method
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(method, *args, **kwargs)
+
+        return call
+
+
+class CoalescingBookService:
+    """
+    Awaitable facade that coalesces identical concurrent reads through a
+    SingleFlight: callers asking for the same thing while it is in flight
+    share one query.
+
+    Each query runs on a session of its own from `session_factory`, closed when
+    the query finishes: callers joining it may outlive (or be cancelled before)
+    the caller that started it, so no request's session is borrowed.
+
+    Keys include a write epoch bumped after every other method call, so a read
+    issued after this process finished a write never joins a read that started
+    before it. Writes from other workers are covered by the `as_of` change
+    counter the list and detail routes read first and pass along: a read only
+    joins one whose caller had already seen the same counter, so the rows
+    returned are never older than the ETag built from it.
+    """
+
+    READS = ("get_books", "get_books_by_ids", "search_books", "get_book", "get_book_response", "get_book_version", "get_change_counter")
+
+    def __init__(self, service, group: SingleFlight, session_factory):
+        self._service = service
+        self._group = group
+        self._session_factory = session_factory
+        self._epoch = 0
+
+    async def _query(self, method, *args, **kwargs):
+        db = self._session_factory()
+        try:
+            return await method(db, *args, **kwargs)
         finally:
-            db.close() 
+            closed = db.close()
+            if inspect.isawaitable(closed):
+                await closed
+
+    def __getattr__(self, name):
+        method = getattr(self._service, name)
+        if name in self.READS:
+            async def read(db, *args, **kwargs):
+                key = (name, self._epoch, args, tuple(sorted(kwargs.items())))
+                return await self._group.do(key, lambda: self._query(method, *args, **kwargs))
+
+            return read
+        if not inspect.iscoroutinefunction(method):
+            return method
+
+        async def write(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self._epoch += 1
+
+        return write
+
+
+read_coalescer = SingleFlight()
+register_metrics("read_coalescing", read_coalescer.stats)
+
+
+class BatchingBookService:
+    """
+    Awaitable facade that sends single-book creates and updates through a
+    GroupCommitter, so concurrent writes share one transaction. The batch runs
+    on its own session; the caller's is not used for these writes.
+    """
+
+    def __init__(self, service, committer: GroupCommitter):
+        self._service = service
+        self._committer = committer
+
+    async def create_book(self, db, book: BookCreate):
+        return await self._committer.submit(("create", None, book, None))
+
+    async def update_book(self, db, book_id: int, book: BookPut, expected_version: int = None):
+        return await self._committer.submit(("update", book_id, book, expected_version))
+
+    async def update_book_partially(self, db, book_id: int, book: BookPatch, expected_version: int = None):
+        return await self._committer.submit(("update_partially", book_id, book, expected_version))
+
+    def __getattr__(self, name):
+        return getattr(self._service, name)
+
+
+async def _write_batch(writes: list) -> list:
+    return await run_in_threadpool(book_service.write_batch, SessionLocal(), writes)
+
+
+write_committer = GroupCommitter(
+    _write_batch, settings.WRITE_BATCH_WINDOW_MS / 1000, settings.WRITE_BATCH_MAX_SIZE
+)
+register_metrics("write_batching", write_committer.stats)
+
+
+async def import_books(service, db, records, batch_size: int) -> dict:
+    """
+    Drive a streaming import: gather parsed records into batches, commit each
+    batch through `service.import_batch`, and publish progress after every batch.
+
+    :param service: An awaitable book service (async or threaded).
+    :param records: Async iterator of (row number, record or parse error) pairs.
+    :param batch_size: Rows validated and committed together.
+    :return: Import summary with counts and (capped) per-row errors.
+    """
+    started = time.perf_counter()
+    summary = {"rows": 0, "imported": 0, "failed": 0, "batches": 0, "errors": [], "errors_truncated": False}
+
+    def record_error(row: int, errors):
+        summary["failed"] += 1
+        if len(summary["errors"]) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            summary["errors"].append({"row": row, "errors": errors})
+        else:
+            summary["errors_truncated"] = True
+
+    async def flush(rows: list, items: list):
+        results = await service.import_batch(db, items)
+        for row, result in zip(rows, results):
+            if result["status"] == "created":
+                summary["imported"] += 1
+            else:
+                record_error(row, result.get("errors") or result.get("detail"))
+        summary["batches"] += 1
+        add_event(
+            event_type="books-import-progress",
+            message=f"Imported {summary['imported']} of {summary['rows']} rows",
+            data={key: summary[key] for key in ("rows", "imported", "failed", "batches")},
+        )
+
+    rows, items = [], []
+    async for row, record in records:
+        summary["rows"] += 1
+        if isinstance(record, str):
+            record_error(row, record)
+            continue
+        rows.append(row)
+        items.append(record)
+        if len(items) >= batch_size:
+            await flush(rows, items)
+            rows, items = [], []
+    if items:
+        await flush(rows, items)
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["rows"] / elapsed) if elapsed else None
+    add_event(
+        event_type="books-imported",
+        message=f"Import finished: {summary['imported']} rows imported, {summary['failed']} failed",
+        data={key: summary[key] for key in ("rows", "imported", "failed", "batches")},
+    )
+    return summary
 
 
 book_service = BookService()
+async_book_service = AsyncBookService()
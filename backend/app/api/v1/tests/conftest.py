@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the application at a throwaway database before anything imports settings
+_db_dir = tempfile.mkdtemp(prefix="books-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'books.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.db.database import SessionLocal, init_db  # noqa: E402
+from backend.app.db.models import Book  # noqa: E402
+from backend.app.api.v1.services.books import book_cache, book_count  # noqa: E402
+
+init_db()
+
+
+@pytest.fixture
+def client():
+    """
+    Test client against an empty books table.
+    """
+    db = SessionLocal()
+    try:
+        db.query(Book).delete()
+        db.commit()
+    finally:
+        db.close()
+    book_count.invalidate()
+    book_cache.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    response = client.post("/v1/auth/login", json={"username": "admin", "password": "admin123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def create_book(client, auth_headers):
+    """
+    Factory creating a book through the API and returning its JSON.
+    """
+    def _create(**overrides):
+        payload = {
+            "title": "Test Book",
+            "author": "Author Name",
+            "published_date": "2023-01-01",
+            "summary": "This is a test book.",
+            "genre": "Fiction",
+        }
+        payload.update(overrides)
+        response = client.post("/v1/books/", headers=auth_headers, json=payload)
+        assert response.status_code == 200
+        return response.json()["book"]
+    return _create
@@ -1,4 +1,11 @@
+import asyncio
+import threading
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from backend.app.core.executor import BoundedExecutor, ExecutorOverloadedError
+from backend.app.core.security import create_access_token, token_cache, verify_access_token
 from backend.app.main import app
 
 client = TestClient(app)
@@ -18,3 +25,34 @@ def test_login_failure():
     )
     assert response.status_code == 401
     assert response.json() == {"detail": "Invalid username or password"}
+
+def test_verified_tokens_are_cached_until_exp():
+    token = create_access_token({"sub": "admin"})
+    hits = token_cache.hits
+    assert verify_access_token(token)["sub"] == "admin"
+    assert verify_access_token(token)["sub"] == "admin"
+    assert token_cache.hits == hits + 1
+
+    # An entry past its exp is never served; the token is decoded again and rejected
+    expired = create_access_token({"sub": "admin"}, expires_delta=timedelta(seconds=-1))
+    token_cache.put(expired, {"sub": "admin", "exp": 1})
+    with pytest.raises(HTTPException) as error:
+        verify_access_token(expired)
+    assert error.value.detail == "Token has expired"
+
+def test_auth_executor_rejects_when_full():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        waiting = asyncio.ensure_future(executor.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["running"] == 1 and executor.stats()["queued"] == 1
+        with pytest.raises(ExecutorOverloadedError):
+            await executor.run(lambda: "rejected")
+        release.set()
+        assert await asyncio.gather(running, waiting) == [True, "done"]
+
+    asyncio.run(scenario())
+    assert executor.stats()["completed"] == 2 and executor.stats()["rejected"] == 1
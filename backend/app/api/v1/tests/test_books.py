@@ -1,4 +1,31 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+from datetime import date
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from backend.app.api.v1.services.books import (
+    SORT_OPTIONS,
+    CoalescingBookService,
+    _count_statement,
+    _filter_clauses,
+    _list_statements,
+    async_book_service,
+    book_cache,
+    book_service,
+    page_json,
+)
+from backend.app.core.cache import CachedResponse, MemoryCacheBackend, ResponseCache
+from backend.app.core.config import settings
+from backend.app.core.group_commit import GroupCommitter
+from backend.app.core.pagination import encode_cursor
+from backend.app.core.singleflight import SingleFlight
+from backend.app.db.database import AsyncSessionLocal, SessionLocal, get_async_engine, get_engine, sqlite_pragmas
+from backend.app.db.schemas.books import BookCreate, BookPatch, BooksResponse
 from backend.app.main import app
 
 client = TestClient(app)
@@ -54,3 +81,482 @@ def test_delete_book():
     response = client.delete("/v1/books/1")
     assert response.status_code == 200
     assert response.json() == {"detail": "Book deleted"}
+
+def test_get_books_cursor_pagination(client, auth_headers, create_book):
+    ids = [create_book(title=f"Book {i}")["id"] for i in range(5)]
+
+    seen = []
+    response = client.get("/v1/books/?limit=2", headers=auth_headers)
+    while True:
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(item["id"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        response = client.get(f"/v1/books/?limit=2&cursor={body['next_cursor']}", headers=auth_headers)
+    assert seen == ids
+
+def test_get_books_invalid_cursor(client, auth_headers):
+    response = client.get("/v1/books/?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_get_books_tampered_cursor_value(client, auth_headers, create_book):
+    create_book()
+    for value in (["a"], {"a": 1}):
+        cursor = encode_cursor("title", value, 1)
+        response = client.get(f"/v1/books/?sort=title&cursor={cursor}", headers=auth_headers)
+        assert response.status_code == 400
+
+def test_get_books_cursor_with_skip(client, auth_headers, create_book):
+    create_book()
+    create_book()
+    cursor = client.get("/v1/books/?limit=1", headers=auth_headers).json()["next_cursor"]
+    response = client.get(f"/v1/books/?skip=1&cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_get_books_total_tracks_writes(client, auth_headers, create_book):
+    first = create_book()
+    create_book()
+    assert client.get("/v1/books/", headers=auth_headers).json()["total"] == 2
+
+    client.delete(f"/v1/books/{first['id']}", headers=auth_headers)
+    assert client.get("/v1/books/", headers=auth_headers).json()["total"] == 1
+
+def test_get_books_without_total(client, auth_headers, create_book):
+    create_book()
+    body = client.get("/v1/books/?include_total=false", headers=auth_headers).json()
+    assert body["total"] is None
+    assert len(body["items"]) == 1
+
+def test_get_book_not_found(client, auth_headers):
+    response = client.get("/v1/books/999999", headers=auth_headers)
+    assert response.status_code == 404
+
+def test_sync_and_async_services_agree(client, create_book):
+    create_book(title="First")
+    create_book(title="Second")
+
+    async def list_async():
+        async with AsyncSessionLocal() as db:
+            books, total, next_cursor = await async_book_service.get_books(db, 0, 1)
+            return [book.title for book in books], total, next_cursor
+
+    books, total, next_cursor = book_service.get_books(SessionLocal(), 0, 1)
+    assert asyncio.run(list_async()) == ([book.title for book in books], total, next_cursor)
+
+def test_bulk_create_reports_each_item(client, auth_headers):
+    response = client.post(
+        "/v1/books/bulk",
+        headers=auth_headers,
+        json=[
+            {"title": "One", "author": "A", "genre": "Fiction", "published_date": "2001-01-01"},
+            {"author": "Missing title", "genre": "Fiction"},
+            {"title": "Three", "author": "C", "genre": "Poetry"},
+        ],
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == ["created", "invalid", "created"]
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+
+    listing = client.get("/v1/books/", headers=auth_headers).json()
+    assert listing["total"] == 2
+    assert [book["title"] for book in listing["items"]] == ["One", "Three"]
+
+def test_bulk_update_and_delete(client, auth_headers, create_book):
+    first, second = create_book(title="First"), create_book(title="Second")
+
+    response = client.patch(
+        "/v1/books/bulk",
+        headers=auth_headers,
+        json=[{"id": first["id"], "genre": "Classics"}, {"id": 999999, "genre": "Classics"}],
+    )
+    assert [result["status"] for result in response.json()["results"]] == ["updated", "not_found"]
+    assert client.get(f"/v1/books/{first['id']}", headers=auth_headers).json()["genre"] == "Classics"
+    assert client.get(f"/v1/books/{second['id']}", headers=auth_headers).json()["genre"] == "Fiction"
+
+    response = client.request("DELETE", "/v1/books/bulk", headers=auth_headers, json=[first["id"], 999999])
+    assert [result["status"] for result in response.json()["results"]] == ["deleted", "not_found"]
+    assert client.get("/v1/books/", headers=auth_headers).json()["total"] == 1
+
+def test_bulk_failures_stay_with_their_items(client, auth_headers, create_book):
+    first, second, third = create_book(title="First"), create_book(title="Second"), create_book(title="Third")
+    with get_engine().begin() as connection:
+        connection.execute(text(
+            "CREATE TRIGGER test_reject_boom BEFORE UPDATE ON books WHEN NEW.title = 'Boom' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+    try:
+        response = client.patch("/v1/books/bulk", headers=auth_headers, json=[
+            {"id": first["id"], "title": "Renamed"},
+            {"id": second["id"], "title": "Boom"},
+            {"id": third["id"], "title": None},
+        ])
+    finally:
+        with get_engine().begin() as connection:
+            connection.execute(text("DROP TRIGGER test_reject_boom"))
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["updated", "error", "invalid"]
+    assert results[1]["id"] == second["id"] and "rejected" not in results[1]["detail"]
+    assert client.get(f"/v1/books/{first['id']}", headers=auth_headers).json()["title"] == "Renamed"
+
+    response = client.request("DELETE", "/v1/books/bulk", headers=auth_headers, json=[first["id"], first["id"]])
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == ["deleted", "duplicate"]
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+
+def test_export_ndjson_and_csv(client, auth_headers, create_book):
+    create_book(title="First", published_date="1999-12-31")
+    create_book(title="Second, with comma", published_date=None)
+
+    response = client.get("/v1/books/export?format=ndjson", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["First", "Second, with comma"]
+    assert rows[0]["published_date"] == "1999-12-31"
+
+    response = client.get("/v1/books/export?format=csv", headers=auth_headers)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["First", "Second, with comma"]
+
+    assert client.get("/v1/books/export?format=xml", headers=auth_headers).status_code == 400
+
+def test_import_ndjson_reports_row_errors(client, auth_headers):
+    body = "\n".join([
+        '{"title": "One", "author": "A", "genre": "Fiction", "published_date": "2001-01-01"}',
+        '{"author": "Missing title", "genre": "Fiction"}',
+        'not json',
+        '{"title": "Four", "author": "D", "genre": "Poetry"}',
+    ])
+    response = client.post("/v1/books/import?format=ndjson&batch_size=2", headers=auth_headers, content=body)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["rows"], summary["imported"], summary["failed"]) == (4, 2, 2)
+    assert [error["row"] for error in summary["errors"]] == [2, 3]
+    assert summary["batches"] == 2
+
+    listing = client.get("/v1/books/", headers=auth_headers).json()
+    assert [book["title"] for book in listing["items"]] == ["One", "Four"]
+
+def test_import_csv_with_multiline_field(client, auth_headers):
+    body = (
+        "title,author,genre,published_date,summary\n"
+        'First,A,Fiction,1999-12-31,"Spans\ntwo lines, with a comma"\n'
+        "Second,B,Poetry,,\n"
+    )
+    response = client.post("/v1/books/import?format=csv", headers=auth_headers, content=body)
+    assert response.json()["imported"] == 2
+
+    books = client.get("/v1/books/", headers=auth_headers).json()["items"]
+    assert books[0]["summary"] == "Spans\ntwo lines, with a comma"
+    assert books[1]["published_date"] is None
+
+    assert client.post("/v1/books/import?format=xml", headers=auth_headers, content="").status_code == 400
+    assert client.post("/v1/books/import?batch_size=0", headers=auth_headers, content="").status_code == 400
+
+def test_search_ranks_and_tracks_writes(client, auth_headers, create_book):
+    dune = create_book(title="Dune", author="Frank Herbert", summary="Spice and sandworms on a desert planet.")
+    other = create_book(title="Children of Dune", author="Frank Herbert", summary="The desert empire falters.")
+    create_book(title="Emma", author="Jane Austen", summary="A young matchmaker.")
+    for _ in range(4):
+        create_book()  # bm25 only ranks terms that are rare in the collection
+
+    response = client.get("/v1/books/search?q=desert", headers=auth_headers)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert {item["id"] for item in items} == {dune["id"], other["id"]}
+    assert "<mark>desert</mark>" in items[0]["snippet"]
+
+    # Title hits outrank summary hits; every word must match; stemming and prefixes match
+    solitaire = create_book(title="Desert Solitaire", author="Edward Abbey", summary="A season in the wilderness.")
+    items = client.get("/v1/books/search?q=desert", headers=auth_headers).json()["items"]
+    assert [item["id"] for item in items][0] == solitaire["id"]
+    assert client.get("/v1/books/search?q=spice empire", headers=auth_headers).json()["items"] == []
+    assert client.get("/v1/books/search?q=sandworm", headers=auth_headers).json()["items"][0]["id"] == dune["id"]
+    assert len(client.get("/v1/books/search?q=match*", headers=auth_headers).json()["items"]) == 1
+
+    client.patch(f"/v1/books/{dune['id']}", headers=auth_headers, json={"summary": "Politics on Arrakis."})
+    client.delete(f"/v1/books/{other['id']}", headers=auth_headers)
+    assert [item["id"] for item in client.get("/v1/books/search?q=desert", headers=auth_headers).json()["items"]] == [
+        solitaire["id"]
+    ]
+    assert client.get("/v1/books/search?q=arrakis", headers=auth_headers).json()["items"][0]["id"] == dune["id"]
+
+    assert client.get('/v1/books/search?q="-', headers=auth_headers).status_code == 400
+
+def test_get_books_filters_and_sort(client, auth_headers, create_book):
+    create_book(title="C", author="Ann", genre="Poetry", published_date="2001-05-01")
+    create_book(title="A", author="Bob", genre="Fiction", published_date=None)
+    create_book(title="B", author="Ann", genre="Fiction", published_date="1999-01-01")
+    create_book(title="D", author="Ann", genre="Fiction", published_date=None)
+    create_book(title="E", author="Cat", genre="Fiction", published_date="2010-10-10")
+
+    def titles(query):
+        response = client.get(f"/v1/books/?{query}", headers=auth_headers)
+        assert response.status_code == 200
+        return [book["title"] for book in response.json()["items"]], response.json()["total"]
+
+    assert titles("author=Ann&sort=title") == (["B", "C", "D"], 3)
+    assert titles("genre=Fiction&sort=-title") == (["E", "D", "B", "A"], 4)
+    assert titles("published_from=2000-01-01&published_to=2010-10-10&sort=published_date") == (["C", "E"], 2)
+    assert titles("author=Ann&genre=Fiction&published_to=2000-12-31") == (["B"], 1)
+
+    # Cursor pages walk through NULL dates in both directions (NULLs sort first)
+    for sort, expected in [("published_date", ["A", "D", "B", "C", "E"]), ("-published_date", ["E", "C", "B", "D", "A"])]:
+        seen, cursor = [], ""
+        while True:
+            page = client.get(f"/v1/books/?sort={sort}&limit=2&cursor={cursor}", headers=auth_headers).json()
+            seen += [book["title"] for book in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        assert seen == expected
+
+    assert client.get("/v1/books/?sort=summary", headers=auth_headers).status_code == 400
+    assert client.get("/v1/books/?published_from=2010-01-01&published_to=2000-01-01", headers=auth_headers).status_code == 400
+
+def test_list_queries_use_indexes(client):
+    """
+    EXPLAIN QUERY PLAN every filter/sort/cursor combination: filtered queries
+    must seek an index and unfiltered ones must read in index order.
+    """
+
+    filter_sets = [
+        {},
+        {"author": "Ann"},
+        {"genre": "Fiction"},
+        {"published_from": date(2000, 1, 1), "published_to": date(2010, 12, 31)},
+        {"author": "Ann", "published_from": date(2000, 1, 1)},
+        {"genre": "Fiction", "published_to": date(2010, 12, 31)},
+        {"author": "Ann", "genre": "Fiction"},
+    ]
+
+    def plan(statement):
+        sql = str(statement.compile(get_engine(), compile_kwargs={"literal_binds": True}))
+        with get_engine().connect() as connection:
+            return [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+    for filters, sort in itertools.product(filter_sets, SORT_OPTIONS):
+        clauses = _filter_clauses(**filters)
+        key = sort.lstrip("-")
+        cursors = [None, encode_cursor(sort, {"id": 5, "published_date": "2001-01-01"}.get(key, "M"), 5)]
+        if key == "published_date":
+            cursors.append(encode_cursor(sort, None, 5))
+        for cursor in cursors:
+            for statement in _list_statements(0, cursor, sort, clauses):
+                steps = plan(statement.limit(11))
+                label = f"filters={filters} sort={sort} cursor={cursor}: {steps}"
+                books_step = next(step for step in steps if " books" in step)
+                if clauses:
+                    assert books_step.startswith("SEARCH books USING"), label
+                elif books_step == "SCAN books":
+                    # Walking the rowid b-tree is an ordered read of the primary key
+                    assert sort.lstrip("-") == "id" and cursor is None, label
+                else:
+                    assert books_step.startswith(("SEARCH books USING", "SCAN books USING INDEX")), label
+                    assert not any("TEMP B-TREE" in step for step in steps), label
+        if clauses:
+            assert plan(_count_statement(clauses))[0].startswith("SEARCH books USING"), filters
+
+def test_get_book_is_cached_and_invalidated(client, auth_headers, create_book):
+    book = create_book(title="Cached")
+    url = f"/v1/books/{book['id']}"
+    hits = book_cache.hits
+
+    first = client.get(url, headers=auth_headers)
+    second = client.get(url, headers=auth_headers)
+    assert first.json() == second.json() == book
+    assert book_cache.hits == hits + 1
+
+    client.patch(url, headers=auth_headers, json={"title": "Renamed"})
+    assert client.get(url, headers=auth_headers).json()["title"] == "Renamed"
+    client.patch("/v1/books/bulk", headers=auth_headers, json=[{"id": book["id"], "genre": "Classics"}])
+    assert client.get(url, headers=auth_headers).json()["genre"] == "Classics"
+    client.delete(url, headers=auth_headers)
+    assert client.get(url, headers=auth_headers).status_code == 404
+
+    metrics = client.get("/v1/metrics/", headers=auth_headers).json()["book_cache"]
+    assert {"hits", "misses", "evictions", "size"} <= set(metrics)
+
+def test_response_cache_skips_stale_fills():
+    cache = ResponseCache(MemoryCacheBackend(max_entries=2, ttl_seconds=60))
+    generation = cache.generation
+    cache.invalidate(1)  # a write lands while the reader is loading
+    cache.fill(1, CachedResponse("\"1.1\"", b"old"), generation)
+    assert cache.get(1) is None and cache.stale_fills == 1
+
+    for key in (1, 2, 3):
+        cache.fill(key, CachedResponse(f"\"{key}.1\"", b"x"), cache.generation)
+    assert cache.get(1) is None and cache.backend.evictions == 1
+
+def test_conditional_get_and_if_match(client, auth_headers, create_book):
+    book = create_book(title="Versioned")
+    url = f"/v1/books/{book['id']}"
+
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+    book_cache.clear()  # revalidation without a cached body reads only the version
+    assert client.get(url, headers={**auth_headers, "If-None-Match": f"W/{etag}"}).status_code == 304
+
+    list_etag = client.get("/v1/books/", headers=auth_headers).headers["ETag"]
+    assert client.get("/v1/books/", headers={**auth_headers, "If-None-Match": list_etag}).status_code == 304
+
+    updated = client.patch(url, headers={**auth_headers, "If-Match": etag}, json={"title": "Renamed"})
+    assert updated.status_code == 200 and updated.headers["ETag"] != etag
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).headers["ETag"] == updated.headers["ETag"]
+    assert client.get("/v1/books/", headers={**auth_headers, "If-None-Match": list_etag}).status_code == 200
+
+    stale = client.put(url, headers={**auth_headers, "If-Match": etag}, json={**book, "title": "Lost update"})
+    assert stale.status_code == 412
+    assert client.delete(url, headers={**auth_headers, "If-Match": '"999.1"'}).status_code == 412
+    assert client.get(url, headers=auth_headers).json()["title"] == "Renamed"
+    assert client.delete(url, headers={**auth_headers, "If-Match": updated.headers["ETag"]}).status_code == 200
+
+def test_identical_concurrent_reads_are_coalesced():
+    class Session:
+        open = 0
+
+        def __init__(self):
+            Session.open += 1
+
+        async def close(self):
+            Session.open -= 1
+
+    class SlowService:
+        reads = 0
+
+        async def get_books(self, db, skip, limit, as_of=None):
+            assert isinstance(db, Session)
+            self.reads += 1
+            await asyncio.sleep(0.01)
+            return [skip, limit]
+
+        async def delete_book(self, db, book_id):
+            return {"detail": "Book deleted"}
+
+    async def scenario():
+        group = SingleFlight()
+        inner = SlowService()
+        service = CoalescingBookService(inner, group, Session)
+        # The flight queries on its own session, whatever the callers pass
+        pages = await asyncio.gather(*(service.get_books(object(), 0, 10) for _ in range(5)))
+        assert pages == [[0, 10]] * 5 and inner.reads == 1 and Session.open == 0
+        assert group.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+        # A read issued after a write finished never joins one that started before it
+        before = asyncio.ensure_future(service.get_books(None, 0, 10))
+        await asyncio.sleep(0)
+        await service.delete_book(None, 1)
+        await asyncio.gather(before, service.get_books(None, 0, 10))
+        assert inner.reads == 3 and Session.open == 0
+
+        # Nor one that started before a newer change counter (another worker's write) was read
+        await asyncio.gather(service.get_books(None, 0, 10, as_of=1), service.get_books(None, 0, 10, as_of=2))
+        assert inner.reads == 5
+
+    asyncio.run(scenario())
+
+def test_pooled_connections_are_tuned():
+    checks = "SELECT * FROM pragma_journal_mode, pragma_synchronous, pragma_busy_timeout, pragma_temp_store"
+    with get_engine().connect() as connection:
+        assert tuple(connection.execute(text(checks)).one()) == ("wal", 1, 5000, 2)
+
+    async def async_settings():
+        try:
+            async with get_async_engine().connect() as connection:
+                return tuple((await connection.execute(text(checks))).one())
+        finally:
+            await get_async_engine().dispose()  # pooled connections belong to this event loop
+
+    assert asyncio.run(async_settings()) == ("wal", 1, 5000, 2)
+    with pytest.raises(ValueError):
+        sqlite_pragmas("WAL; DROP TABLE books", "NORMAL", 0, -2000, 0, "MEMORY")
+
+def test_single_statement_writes(client, auth_headers, create_book):
+    book = create_book(title="Returning")
+    url = f"/v1/books/{book['id']}"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+    # An empty patch changes nothing, so the version (and ETag) stays put
+    assert client.patch(url, headers=auth_headers, json={}).headers["ETag"] == etag
+    updated = client.put(url, headers=auth_headers, json={**book, "title": "Returned"})
+    assert updated.json() == {**book, "title": "Returned"}
+
+    assert client.delete(url, headers=auth_headers).status_code == 200
+    assert client.patch(url, headers=auth_headers, json={"title": "Gone"}).status_code == 404
+    assert client.put(url, headers={**auth_headers, "If-Match": etag}, json=book).status_code == 404
+    assert client.delete(url, headers=auth_headers).status_code == 404
+
+def test_group_commit_isolates_failing_writes(client, auth_headers, create_book):
+    book = create_book(title="Batched")
+    outcomes = book_service.write_batch(SessionLocal(), [
+        ("create", None, BookCreate(title="New", author="A", genre="Fiction"), None),
+        ("update_partially", 999999, BookPatch(title="Missing"), None),
+        ("update_partially", book["id"], BookPatch(title="Stale"), 42),
+        ("update_partially", book["id"], BookPatch(title="Renamed"), None),
+    ])
+    assert outcomes[0].title == "New" and outcomes[3].title == "Renamed"
+    assert [outcome.status_code for outcome in outcomes[1:3]] == [404, 412]
+    titles = {item["title"] for item in client.get("/v1/books/", headers=auth_headers).json()["items"]}
+    assert titles == {"New", "Renamed"}
+
+    async def run_batch(writes):
+        return [ValueError(write) if write == "bad" else write.upper() for write in writes]
+
+    async def scenario():
+        committer = GroupCommitter(run_batch, window_seconds=0.01, max_size=3)
+        results = await asyncio.gather(*(committer.submit(w) for w in ["a", "bad", "c", "d"]), return_exceptions=True)
+        assert results[0] == "A" and isinstance(results[1], ValueError) and results[2:] == ["C", "D"]
+        assert committer.stats()["batches"] == 2 and committer.stats()["largest_batch"] == 3
+
+    asyncio.run(scenario())
+
+def test_list_fast_path_matches_schema(client, auth_headers, create_book):
+    create_book(title="Cien años de soledad", published_date=None, summary=None)
+    create_book(title="Dune", published_date="1965-08-01")
+    books, total, next_cursor = book_service.get_books(SessionLocal(), 0, 1)
+
+    expected = BooksResponse.model_validate(
+        {"items": books, "total": total, "skip": 0, "limit": 1, "next_cursor": next_cursor}, from_attributes=True
+    )
+    assert page_json(books, total, 0, 1, next_cursor) == expected.model_dump_json().encode()
+    response = client.get("/v1/books/?limit=1", headers=auth_headers)
+    assert response.content == expected.model_dump_json().encode()
+
+def test_sparse_fieldsets(client, auth_headers, create_book):
+    first = create_book(title="Alpha", author="Ann")
+    create_book(title="Beta", author="Bob")
+
+    page = client.get("/v1/books/?fields=author&sort=title&limit=1", headers=auth_headers)
+    assert page.json()["items"] == [{"author": "Ann", "id": first["id"]}]
+    following = client.get(f"/v1/books/?fields=author&sort=title&cursor={page.json()['next_cursor']}", headers=auth_headers)
+    assert [item["author"] for item in following.json()["items"]] == ["Bob"]
+    assert page.headers["ETag"] != client.get("/v1/books/?sort=title&limit=1", headers=auth_headers).headers["ETag"]
+    assert client.get("/v1/books/?fields=isbn", headers=auth_headers).status_code == 400
+
+    url = f"/v1/books/{first['id']}?fields=title,genre"
+    for _ in range(2):  # a miss selects only the projected columns; then it is cut from the cached book
+        response = client.get(url, headers=auth_headers)
+        assert response.json() == {"title": "Alpha", "genre": "Fiction", "id": first["id"]}
+        client.get(f"/v1/books/{first['id']}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    assert etag != client.get(f"/v1/books/{first['id']}", headers=auth_headers).headers["ETag"]
+    book_cache.clear()
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+    assert client.patch(url, headers={**auth_headers, "If-Match": etag}, json={"genre": "Poetry"}).status_code == 200
+    assert client.get(url, headers={**auth_headers, "If-None-Match": etag}).json()["genre"] == "Poetry"
+
+def test_batch_lookup_keeps_request_order(client, auth_headers, create_book, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_LOOKUP_CHUNK_SIZE", 2)
+    ids = [create_book(title=title)["id"] for title in ("A", "B", "C")]
+    requested = [ids[2], 999999, ids[0], ids[2], ids[1]]
+
+    response = client.get(f"/v1/books/batch?ids={','.join(map(str, requested))}", headers=auth_headers)
+    assert [book["title"] for book in response.json()["items"]] == ["C", "A", "B"]
+    assert response.json()["missing"] == [999999]
+
+    posted = client.post("/v1/books/batch?fields=title", headers=auth_headers, json={"ids": requested})
+    assert posted.json()["items"] == [{"title": "C", "id": ids[2]}, {"title": "A", "id": ids[0]}, {"title": "B", "id": ids[1]}]
+    assert client.get("/v1/books/batch?ids=1,x", headers=auth_headers).status_code == 400
+    assert client.post("/v1/books/batch", headers=auth_headers, json={"ids": []}).status_code == 400
@@ -0,0 +1,45 @@
+import sqlite3
+
+from backend.app.db.migrations import MIGRATIONS, migrate
+
+
+def test_migrates_legacy_database(tmp_path):
+    """
+    A database in the original layout (TEXT dates, no version) is upgraded in
+    place; re-running the migrations is a no-op.
+    """
+    path = str(tmp_path / "legacy.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE books (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, author TEXT NOT NULL, "
+        "published_date TEXT, summary TEXT, genre TEXT NOT NULL)"
+    )
+    connection.executemany(
+        "INSERT INTO books (title, author, published_date, summary, genre) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("Dune", "Frank Herbert", "1965-08-01", "Desert planet.", "Science Fiction"),
+            ("Emma", "Jane Austen", None, "A matchmaker.", "Fiction"),
+            ("Undated", "Anonymous", "someday", None, "Fiction"),
+        ],
+    )
+    connection.commit()
+    connection.close()
+
+    assert migrate(path, batch_size=2) == [step.version for step in MIGRATIONS]
+    assert migrate(path) == []
+
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute("PRAGMA user_version").fetchone()[0] == MIGRATIONS[-1].version
+        columns = {row[1]: row[2] for row in connection.execute("PRAGMA table_info(books)")}
+        assert columns["published_date"] == "DATE" and "published_on" not in columns
+        dates = connection.execute("SELECT title, published_date FROM books ORDER BY id").fetchall()
+        assert dates == [("Dune", "1965-08-01"), ("Emma", None), ("Undated", None)]
+        assert connection.execute("SELECT value FROM books_meta WHERE key = 'book_count'").fetchone() == (3,)
+        assert connection.execute("SELECT rowid FROM books_fts WHERE books_fts MATCH 'desert'").fetchall() == [(1,)]
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM books WHERE published_date >= '1960-01-01'"
+        ).fetchall()
+        assert "ix_books_published_date" in plan[0][3]
+    finally:
+        connection.close()
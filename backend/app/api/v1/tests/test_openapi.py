@@ -0,0 +1,17 @@
+import json
+
+from fastapi import FastAPI
+
+from backend.app.core.config import settings
+from backend.app.core.openapi import build_openapi, custom_openapi
+from backend.app.main import app
+
+
+def test_serves_prebuilt_schema(tmp_path, monkeypatch):
+    path = tmp_path / "openapi.json"
+    path.write_text(json.dumps(build_openapi(app)))
+    monkeypatch.setattr(settings, "OPENAPI_SCHEMA_PATH", str(path))
+
+    fresh = FastAPI(routes=[])  # would build an empty schema if the file were ignored
+    schema = custom_openapi(fresh)
+    assert "/v1/books/" in schema["paths"] and schema["info"]["x-logo"]
@@ -1,4 +1,13 @@
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
 from fastapi.testclient import TestClient
+from backend.app.core.event_bus import SQLiteEventBus
+from backend.app.core.sse import EventBroadcaster, EventDispatcher, ReplayLog, format_event
 from backend.app.main import app
 
 client = TestClient(app)
@@ -7,3 +16,198 @@ def test_stream_updates():
     response = client.get("/v1/stream/")
     assert response.status_code == 200
     assert response.headers["content-type"] == "text/event-stream"
+
+def test_events_reach_every_subscriber():
+    async def scenario():
+        broadcaster = EventBroadcaster(subscriber_queue_size=10)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish({"type": "book-created"})
+        return await first.drain(1), await second.drain(1)
+
+    first, second = asyncio.run(scenario())
+    assert first == second == [{"type": "book-created"}]
+
+def test_slow_subscriber_drops_oldest():
+    async def scenario():
+        broadcaster = EventBroadcaster(subscriber_queue_size=2)
+        subscriber = broadcaster.subscribe()
+        for i in range(5):
+            broadcaster.publish({"type": "tick", "data": {"i": i}})
+        events = await subscriber.drain(1)
+        return events, broadcaster.stats()
+
+    events, stats = asyncio.run(scenario())
+    assert [event["data"]["i"] for event in events] == [3, 4]
+    assert stats["lag"][0]["dropped"] == 3
+
+def test_publish_from_worker_thread():
+    async def scenario():
+        broadcaster = EventBroadcaster(subscriber_queue_size=10)
+        subscriber = broadcaster.subscribe()
+        threading.Thread(target=broadcaster.publish, args=({"type": "book-deleted"},)).start()
+        return await subscriber.drain(5)
+
+    assert asyncio.run(scenario()) == [{"type": "book-deleted"}]
+
+def test_dispatcher_overflow_policies():
+    class Stalled(EventBroadcaster):
+        def publish_many(self, events):
+            raise AssertionError("dispatcher thread should not be running")
+
+    for policy, expected in (("drop_oldest", [2, 3]), ("drop_newest", [0, 1])):
+        dispatcher = EventDispatcher(Stalled(10), buffer_size=2, batch_size=10, overflow_policy=policy)
+        dispatcher._thread = object()  # keep the background thread from starting
+        for i in range(4):
+            dispatcher.submit({"i": i})
+        assert [event["i"] for event in dispatcher._buffer] == expected
+        assert dispatcher.stats()["dropped"] == 2
+
+def test_dispatcher_delivers_in_background():
+    async def scenario():
+        broadcaster = EventBroadcaster(subscriber_queue_size=100)
+        dispatcher = EventDispatcher(broadcaster, buffer_size=100, batch_size=10)
+        subscriber = broadcaster.subscribe()
+        for i in range(25):
+            dispatcher.submit({"i": i})
+        events = []
+        while len(events) < 25:
+            events.extend(await subscriber.drain(5))
+        dispatcher.close()
+        return events, dispatcher.stats()
+
+    events, stats = asyncio.run(scenario())
+    assert [event["i"] for event in events] == list(range(25))
+    assert stats["dispatched"] == 25 and stats["dropped"] == 0
+
+def test_dispatcher_counts_failed_batches():
+    class Failing:
+        def publish_many(self, events):
+            raise RuntimeError("bus unavailable")
+
+    dispatcher = EventDispatcher(Failing(), buffer_size=100, batch_size=10)
+    for i in range(3):
+        dispatcher.submit({"i": i})
+    dispatcher.close()
+    stats = dispatcher.stats()
+    assert (stats["dispatched"], stats["failed"]) == (0, 3)
+
+def test_resume_from_last_event_id():
+    async def scenario():
+        broadcaster = EventBroadcaster(100, ReplayLog(max_size=3, max_age_seconds=60, start_id=0))
+        for i in range(1, 6):
+            broadcaster.publish({"id": i, "type": "tick"})
+        resumed = broadcaster.subscribe(last_event_id=3)
+        too_old = broadcaster.subscribe(last_event_id=1)
+        broadcaster.publish({"id": 6, "type": "tick"})
+        return await resumed.drain(1), await too_old.drain(1)
+
+    resumed, too_old = asyncio.run(scenario())
+    assert [event["id"] for event in resumed] == [4, 5, 6]
+    assert too_old[0]["type"] == "resync-required"
+    assert [event["id"] for event in too_old[1:]] == [6]
+
+def test_resume_from_unknown_event_id():
+    log = ReplayLog(max_size=10, max_age_seconds=60, start_id=100)
+    log.append({"id": 101, "type": "tick"})
+    assert log.since(100) == [{"id": 101, "type": "tick"}]
+    assert log.since(50) is None  # issued before this log started
+    assert log.since(500) is None  # never issued
+
+def test_events_are_numbered():
+    assert format_event({"id": 7, "type": "book-created"}).startswith("id: 7\nevent: book-created\n")
+
+def test_sqlite_event_bus_across_processes(tmp_path):
+    path = str(tmp_path / "events.db")
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../.."))
+    # A second "worker" process publishing through the same bus
+    worker = (
+        "from backend.app.core.sse import EventBroadcaster\n"
+        "from backend.app.core.event_bus import SQLiteEventBus\n"
+        f"bus = SQLiteEventBus(EventBroadcaster(10), {path!r})\n"
+        "bus.publish_many([{'type': 'book-created', 'data': {'worker': 2}}])\n"
+        "bus.close()\n"
+    )
+
+    async def scenario():
+        broadcaster = EventBroadcaster(100, ReplayLog(100, 60))
+        bus = SQLiteEventBus(broadcaster, path, poll_interval=0.01)
+        bus.start()
+        subscriber = broadcaster.subscribe()
+        bus.publish_many([{"type": "book-created", "data": {"worker": 1}}])
+        await asyncio.to_thread(subprocess.run, [sys.executable, "-c", worker], check=True, cwd=repo_root)
+        events = []
+        for _ in range(50):
+            events.extend(await subscriber.drain(0.1))
+            if len(events) == 2:
+                break
+        bus.close()
+        return events
+
+    events = asyncio.run(scenario())
+    assert [event["data"]["worker"] for event in events] == [1, 2]
+    assert events[0]["id"] < events[1]["id"]
+
+def test_sqlite_event_bus_follower_survives_errors(tmp_path):
+    async def scenario():
+        broadcaster = EventBroadcaster(100, ReplayLog(100, 60))
+        publish_many, calls = broadcaster.publish_many, []
+
+        def flaky_publish_many(events):
+            calls.append(events)
+            if len(calls) == 1:
+                raise RuntimeError("broadcaster failed")
+            publish_many(events)
+
+        broadcaster.publish_many = flaky_publish_many
+        bus = SQLiteEventBus(broadcaster, str(tmp_path / "events.db"), poll_interval=0.01)
+        bus.start()
+        subscriber = broadcaster.subscribe()
+        bus.publish_many([{"type": "book-created", "data": {"n": 1}}])
+        for _ in range(50):
+            if bus.errors:
+                break
+            await asyncio.sleep(0.01)
+        bus.publish_many([{"type": "book-created", "data": {"n": 2}}])
+        events = []
+        for _ in range(50):
+            events.extend(await subscriber.drain(0.1))
+            if events:
+                break
+        stats, alive = bus.stats(), bus._thread.is_alive()
+        bus.close()
+        return events, stats, alive
+
+    events, stats, alive = asyncio.run(scenario())
+    # The batch that failed is retried, not lost
+    assert [event["data"]["n"] for event in events] == [1, 2]
+    assert stats["errors"] == 1 and alive
+
+def test_sqlite_event_bus_starts_on_existing_log(tmp_path):
+    path = str(tmp_path / "events.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        connection.executemany(
+            "INSERT INTO events (created_at, payload) VALUES (0, ?)",
+            [(json.dumps({"type": "book-created", "data": {"n": n}}),) for n in range(1, 6)],
+        )
+
+    async def drain(subscriber) -> list:
+        return [event["id"] for event in await subscriber.drain(0.1)]
+
+    async def scenario():
+        broadcaster = EventBroadcaster(100, ReplayLog(100, 60))
+        bus = SQLiteEventBus(broadcaster, path, poll_interval=0.01, backlog=3)
+        bus.start()
+        fresh, resumed, stale = broadcaster.subscribe(), broadcaster.subscribe(3), broadcaster.subscribe(1)
+        await asyncio.sleep(0.05)  # let the follower poll
+        seen = [await drain(fresh), await drain(resumed)]
+        resync = await stale.drain(0.1)
+        bus.close()
+        return seen, resync
+
+    (fresh, resumed), resync = asyncio.run(scenario())
+    # Rows from before the start are history for Last-Event-ID, not live events
+    assert fresh == [] and resumed == [4, 5]
+    assert [(event["id"], event["type"]) for event in resync] == [(5, "resync-required")]
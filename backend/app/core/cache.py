@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Hashable, Optional
+
+# A serialized response body with the ETag it was rendered for, and
+# optionally the field values it encodes (to serve projections of it)
+CachedResponse = namedtuple("CachedResponse", ["etag", "body", "data"], defaults=(None,))
+
+
+class MemoryCacheBackend:
+    """
+    Bounded LRU map with a per-entry TTL, local to this process.
+    Thread-safe; every operation is O(1).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires at, value)
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: CachedResponse):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class NullCacheBackend:
+    """
+    Backend that stores nothing; turns the cache off.
+    """
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: Hashable, value: CachedResponse):
+        pass
+
+    def delete(self, key: Hashable):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized responses in front of a backend.
+
+    Readers that miss note the `generation` before loading from the database
+    and hand it back to `fill`. Every invalidation bumps the generation, so a
+    value loaded before a concurrent write is never stored after it.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_fills = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def fill(self, key: Hashable, value: CachedResponse, generation: int):
+        """
+        Store a freshly loaded value unless an invalidation happened since `generation` was read.
+        """
+        with self._lock:
+            if generation != self._generation:
+                self.stale_fills += 1
+                return
+            self.backend.set(key, value)
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self.backend.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "stale_fills": self.stale_fills,
+            **self.backend.stats(),
+        }
+
+
+def create_cache_backend(backend: str, **options):
+    """
+    Build the configured cache backend ("memory" or "none").
+    """
+    if backend == "memory":
+        return MemoryCacheBackend(options["max_entries"], options["ttl_seconds"])
+    if backend == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown cache backend: {backend}")
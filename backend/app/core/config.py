@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 import os
 
@@ -7,6 +8,71 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "secret_key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt hash of the admin password ("admin123"); generate a new one with
+    # python -c "from backend.app.core.security import hash_password; print(hash_password('...'))"
+    ADMIN_PASSWORD_HASH: str = "$2b$12$UZXXq7IecLIrfjwIT.oSKO32UAsXqJ.GAYLxQsLIyWdd9eRCPbN3W"
+    # Verified token payloads kept until their exp, so repeat requests skip jwt.decode
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    # Threads verifying login passwords (bcrypt), and logins allowed to wait for one before 503
+    AUTH_MAX_WORKERS: int = 4
+    AUTH_MAX_QUEUE: int = 64
+    # Serve book routes through AsyncSession (aiosqlite); False uses the sync Session in the threadpool
+    ASYNC_DATABASE: bool = True
+    # SQLite PRAGMAs applied to every pooled connection. WAL lets readers run during a write;
+    # cache size is in KiB when negative (SQLite convention), page counts when positive.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    # Share one query between identical concurrent book reads
+    READ_COALESCING: bool = True
+    # Group commit (opt-in): single-book creates and updates arriving within the window
+    # share one transaction, up to the batch size
+    WRITE_BATCHING: bool = False
+    WRITE_BATCH_WINDOW_MS: float = 2.0
+    WRITE_BATCH_MAX_SIZE: int = 100
+    # Serialized GET /v1/books/{id} responses: backend ("memory" or "none"), size and TTL.
+    # The TTL bounds how long other workers may serve a book changed elsewhere.
+    BOOK_CACHE_BACKEND: str = "memory"
+    BOOK_CACHE_MAX_ENTRIES: int = 10000
+    BOOK_CACHE_TTL_SECONDS: float = 30.0
+    # Bulk endpoints: items accepted per request, and rows written per transaction
+    BULK_MAX_ITEMS: int = 10000
+    BULK_CHUNK_SIZE: int = 500
+    # IDs per IN (...) query of a batch lookup (SQLite caps bound parameters per statement)
+    BATCH_LOOKUP_CHUNK_SIZE: int = 500
+    # Rows updated per transaction by batched data migrations
+    MIGRATION_BATCH_SIZE: int = 10000
+    # Streaming import: rows committed per transaction, and per-row errors echoed back
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_BATCH_SIZE: int = 50000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    # Rows fetched per server-side cursor batch by the export endpoint
+    EXPORT_BATCH_SIZE: int = 1000
+    # Events buffered per SSE client before the oldest are dropped
+    SSE_SUBSCRIBER_QUEUE_SIZE: int = 100
+    SSE_KEEPALIVE_SECONDS: float = 10.0
+    # Events waiting for the background dispatcher, and what to drop when it is full
+    EVENT_BUFFER_SIZE: int = 10000
+    EVENT_BATCH_SIZE: int = 256
+    EVENT_OVERFLOW_POLICY: str = "drop_oldest"  # or "drop_newest"
+    # Recent events kept for clients resuming with Last-Event-ID
+    EVENT_REPLAY_BUFFER_SIZE: int = 1000
+    EVENT_REPLAY_MAX_AGE_SECONDS: float = 300.0
+    # "memory" keeps events in this process; "sqlite" shares them between uvicorn workers on one host
+    EVENT_BUS_BACKEND: str = "memory"
+    EVENT_BUS_PATH: str = os.path.join(BASE_DIR, '../../events.db')
+    EVENT_BUS_POLL_INTERVAL_SECONDS: float = 0.05
+    EVENT_BUS_RETENTION_SECONDS: float = 3600.0
+    # How long the in-process copy of the book count is trusted before re-reading it
+    BOOK_COUNT_CACHE_TTL_SECONDS: float = 5.0
+    # Log per-module import times and startup step times once the app has started
+    STARTUP_PROFILE: bool = False
+    # Serve this pre-generated OpenAPI JSON instead of building the schema on the first /docs hit
+    OPENAPI_SCHEMA_PATH: Optional[str] = None
 
     class Config:
         env_file = ".env"
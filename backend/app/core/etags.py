@@ -0,0 +1,62 @@
+from typing import Optional
+
+
+def projected_etag(etag: str, fields: Optional[tuple]) -> str:
+    """
+    ETag of a sparse fieldset of the representation tagged `etag`; each
+    projection is a different representation, so it gets its own tag.
+    Fields are joined with "+" because header lists of ETags are comma-separated.
+    """
+    if not fields:
+        return etag
+    return f'{etag[:-1]};{"+".join(fields)}"'
+
+
+def book_etag(book_id: int, version: int, fields: Optional[tuple] = None) -> str:
+    """
+    Strong ETag of one book: changes whenever its row version does.
+    """
+    return projected_etag(f'"{book_id}.{version}"', fields)
+
+
+def list_etag(changes: int, fields: Optional[tuple] = None) -> str:
+    """
+    Strong ETag of a list page: the table-wide change counter. Any write to
+    the table changes it, so a page can only match while nothing was written.
+    """
+    return projected_etag(f'"c{changes}"', fields)
+
+
+def _tags(header: str) -> list:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header matches `etag`, i.e. the client's copy is current.
+    Uses the weak comparison required for If-None-Match.
+    """
+    if not header:
+        return False
+    tags = _tags(header)
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def if_match_version(header: Optional[str], book_id: int) -> Optional[int]:
+    """
+    The row version an If-Match header requires for `book_id`.
+
+    :return: None when the header is absent or "*" (any current version), else the version.
+    :raises ValueError: If no strong ETag in the header refers to this book,
+        so the precondition can never hold.
+    """
+    if not header or header.strip() == "*":
+        return None
+    for tag in _tags(header):
+        if tag.startswith("W/"):
+            continue
+        # Any projection of a version names that version
+        book, _, version = tag.strip('"').partition(";")[0].partition(".")
+        if book == str(book_id) and version.isdigit():
+            return int(version)
+    raise ValueError("If-Match does not match the current version of this book.")
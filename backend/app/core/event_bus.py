@@ -0,0 +1,212 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries after the follower hits an error
+_MAX_BACKOFF_SECONDS = 5.0
+
+
+class InProcessEventBus:
+    """
+    Default event bus: numbers events and hands them straight to the local
+    broadcaster. Only clients connected to this process see them.
+    """
+
+    def __init__(self, broadcaster, start_id: int):
+        self.broadcaster = broadcaster
+        self._next_id = start_id
+        broadcaster.replay_log.reset(start_id)
+
+    def start(self):
+        pass
+
+    def publish_many(self, events: list):
+        # Called from the single dispatcher thread, so the sequence needs no lock
+        for event in events:
+            self._next_id += 1
+            event["id"] = self._next_id
+        self.broadcaster.publish_many(events)
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "last_id": self._next_id}
+
+
+class SQLiteEventBus:
+    """
+    Event bus shared by every worker process on one host.
+
+    Published events are appended to a log table in a small SQLite database
+    (WAL mode, separate from the books database). Each process polls the log
+    for rows newer than the last one it has seen and feeds them to its local
+    broadcaster, so every stream sees every write in the same global order.
+    Row IDs double as SSE event IDs, which makes Last-Event-ID valid on any worker.
+    """
+
+    def __init__(self, broadcaster, path: str, poll_interval: float = 0.05,
+                 retention_seconds: float = 3600.0, backlog: int = 1000):
+        self.broadcaster = broadcaster
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.backlog = backlog
+        self._lock = threading.Lock()
+        self._write_connection = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._last_seen = 0
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        return connection
+
+    def start(self):
+        """
+        Start following the log. Recent rows are loaded into the replay log
+        (not delivered) so clients reconnecting from another worker can resume
+        here; only rows written after this point reach live subscribers.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._write_connection = self._connect()
+            latest = self._write_connection.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+            start_id = max(latest - self.backlog, 0)
+            rows = self._write_connection.execute(
+                "SELECT id, payload FROM events WHERE id > ? ORDER BY id", (start_id,)
+            ).fetchall()
+            self.broadcaster.restore(start_id, self._decode(rows))
+            self._last_seen = latest
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._follow, name="event-bus-follower", daemon=True)
+            self._thread.start()
+
+    def publish_many(self, events: list):
+        self.start()
+        now = time.time()
+        with self._lock:
+            self._write_connection.executemany(
+                "INSERT INTO events (created_at, payload) VALUES (?, ?)",
+                [(now, json.dumps(event)) for event in events],
+            )
+        self.published += len(events)
+
+    def _poll(self, connection: sqlite3.Connection) -> bool:
+        """
+        Hand the next rows of the log to the broadcaster.
+        :return: True if any rows were read.
+        """
+        rows = connection.execute(
+            "SELECT id, payload FROM events WHERE id > ? ORDER BY id LIMIT 1000",
+            (self._last_seen,),
+        ).fetchall()
+        if not rows:
+            return False
+        events = self._decode(rows)
+        # Only move past the rows once delivered; a failed batch is retried
+        # (the replay log and subscribers skip IDs they already have)
+        self.broadcaster.publish_many(events)
+        self._last_seen = rows[-1][0]
+        self.received += len(events)
+        return True
+
+    def _decode(self, rows: list) -> list:
+        events = []
+        for row_id, payload in rows:
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                logger.warning("Skipping unreadable event %d in %s", row_id, self.path)
+                continue
+            event["id"] = row_id
+            events.append(event)
+        return events
+
+    def _follow(self):
+        """
+        Poll the log until closed. Errors (a locked or vanished database, a
+        failing broadcaster) are logged and retried with backoff on a fresh
+        connection, so the follower only ever stops on close().
+        """
+        connection = None
+        last_pruned = 0.0
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                if connection is None:
+                    connection = self._connect()
+                if self._poll(connection):
+                    failures = 0
+                    continue
+                if time.monotonic() - last_pruned > 60:
+                    connection.execute(
+                        "DELETE FROM events WHERE created_at < ?", (time.time() - self.retention_seconds,)
+                    )
+                    last_pruned = time.monotonic()
+                failures = 0
+                self._stopping.wait(self.poll_interval)
+            except Exception as e:
+                failures += 1
+                self.errors += 1
+                logger.warning("Event bus follower error (%d in a row), retrying: %s", failures, e)
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except sqlite3.Error:
+                        pass
+                    connection = None
+                self._stopping.wait(min(self.poll_interval * 2 ** failures, _MAX_BACKOFF_SECONDS))
+        if connection is not None:
+            connection.close()
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            connection, self._write_connection = self._write_connection, None
+        self._stopping.set()
+        if thread is not None:
+            thread.join(2)
+        if connection is not None:
+            connection.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "last_seen_id": self._last_seen,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
+
+
+def create_event_bus(backend: str, broadcaster, **options):
+    """
+    Build the configured event bus backend ("memory" or "sqlite").
+    """
+    if backend == "memory":
+        return InProcessEventBus(broadcaster, options["start_id"])
+    if backend == "sqlite":
+        return SQLiteEventBus(
+            broadcaster,
+            options["path"],
+            poll_interval=options["poll_interval"],
+            retention_seconds=options["retention_seconds"],
+            backlog=options["backlog"],
+        )
+    raise ValueError(f"Unknown event bus backend: {backend}")
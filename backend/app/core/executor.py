@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class ExecutorOverloadedError(Exception):
+    """
+    Raised when a BoundedExecutor already has as many calls waiting as it accepts.
+    """
+
+
+class BoundedExecutor:
+    """
+    Dedicated thread pool for slow blocking calls, with admission control.
+
+    At most `max_workers` calls run at once and at most `max_queue` more wait
+    for a thread; further calls fail fast with ExecutorOverloadedError instead
+    of piling up. Keeps work like bcrypt off the event loop and out of the
+    shared threadpool that serves everything else.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _admit(self):
+        with self._lock:
+            if self.running + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorOverloadedError("Too many requests are waiting; try again shortly.")
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+    def _call(self, fn: Callable, args: tuple):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _discard(self, future):
+        # A call cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn: Callable, *args):
+        """
+        Run `fn(*args)` on the pool and await its result.
+        :raises ExecutorOverloadedError: If the queue is full.
+        """
+        self._admit()
+        future = self._pool.submit(self._call, fn, args)
+        future.add_done_callback(self._discard)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
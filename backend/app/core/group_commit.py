@@ -0,0 +1,69 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+
+class GroupCommitter:
+    """
+    Gathers concurrent write requests into batches handed to `run_batch`
+    together, so they can share one transaction (and one fsync).
+
+    A batch is flushed once `max_size` writes are pending or `window_seconds`
+    after the first of them arrived, whichever is first. `run_batch` returns
+    one outcome per write, in order: a result, or an exception for that write
+    alone. Each caller gets its own outcome.
+    """
+
+    def __init__(self, run_batch: Callable[[list], Awaitable[list]], window_seconds: float, max_size: int):
+        self.run_batch = run_batch
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self._pending = []  # (write, future)
+        self._timer = None
+        self._flushes = set()  # batches being written; keeps their tasks referenced
+        self.batches = 0
+        self.writes = 0
+        self.largest_batch = 0
+
+    async def submit(self, write):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((write, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._write(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: List[tuple]):
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            outcomes = await self.run_batch([write for write, _ in batch])
+        except Exception as e:
+            outcomes = [e] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():  # the caller went away
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.writes / self.batches, 2) if self.batches else None,
+            "pending": len(self._pending),
+        }
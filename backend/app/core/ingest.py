@@ -0,0 +1,83 @@
+import csv
+import json
+from typing import AsyncIterator, Tuple, Union
+
+# A parsed record: its 1-based row number and either the field mapping or a parse error message
+Record = Tuple[int, Union[dict, str]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into decoded lines without buffering more than one line.
+    """
+    pending = b""
+    async for chunk in chunks:
+        lines = chunk.split(b"\n")
+        lines[0] = pending + lines[0]
+        pending = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8-sig", errors="replace").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig", errors="replace").rstrip("\r")
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Parse newline-delimited JSON objects incrementally. Blank lines are skipped.
+    """
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, "Each line must be a JSON object."
+            continue
+        yield row, record
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    Parse CSV with a header row incrementally. Empty fields become None.
+
+    Lines are gathered until their quotes balance, so quoted fields spanning
+    several lines are parsed as one record.
+    """
+    header = None
+    row = 0
+    record_lines = []
+    async for line in iter_lines(chunks):
+        record_lines.append(line)
+        text = "\n".join(record_lines)
+        if text.count('"') % 2:
+            continue
+        record_lines = []
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            row += 1
+            yield row, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} fields, got {len(values)}."
+            continue
+        yield row, {name: (value if value != "" else None) for name, value in zip(header, values)}
+    if record_lines:
+        yield row + 1, "Invalid CSV: unterminated quoted field."
+
+
+RECORD_PARSERS = {
+    "ndjson": iter_ndjson_records,
+    "csv": iter_csv_records,
+}
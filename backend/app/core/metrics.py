@@ -0,0 +1,20 @@
+from typing import Callable, Dict
+
+# Named callables returning a JSON-serializable snapshot of a subsystem's counters
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, collector: Callable[[], dict]):
+    """
+    Register a collector whose snapshot is served under `name` by /v1/metrics/.
+    :param name: Section name in the metrics response.
+    :param collector: Callable returning the current counters.
+    """
+    _collectors[name] = collector
+
+
+def collect_metrics() -> dict:
+    """
+    Snapshot every registered collector.
+    """
+    return {name: collector() for name, collector in _collectors.items()}
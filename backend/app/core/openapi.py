@@ -1,14 +1,20 @@
+"""
+Write the OpenAPI schema to a file, to be served via OPENAPI_SCHEMA_PATH:
+
+    python -m backend.app.core.openapi openapi.json
+"""
+import argparse
+import json
+import os
+
 from fastapi.openapi.utils import get_openapi
+from backend.app.core.config import settings
 
-def custom_openapi(app):
+
+def build_openapi(app) -> dict:
     """
-    Generate a custom OpenAPI schema for the FastAPI application.
-    :param app: The FastAPI application instance.
-    :return: The OpenAPI schema.
+    Build the OpenAPI schema from the application's routes.
     """
-    if app.openapi_schema:
-        return app.openapi_schema
-
     openapi_schema = get_openapi(
         title="Books API",
         version="1.0.0",
@@ -28,6 +34,39 @@ def custom_openapi(app):
     openapi_schema["info"]["x-logo"] = {
         "url": "https://example.com/logo.png"
     }
+    return openapi_schema
+
+
+def custom_openapi(app):
+    """
+    Generate a custom OpenAPI schema for the FastAPI application.
+    Loads it from OPENAPI_SCHEMA_PATH instead when that file exists.
+    :param app: The FastAPI application instance.
+    :return: The OpenAPI schema.
+    """
+    if app.openapi_schema:
+        return app.openapi_schema
 
-    app.openapi_schema = openapi_schema
+    path = settings.OPENAPI_SCHEMA_PATH
+    if path and os.path.exists(path):
+        with open(path) as schema_file:
+            app.openapi_schema = json.load(schema_file)
+    else:
+        app.openapi_schema = build_openapi(app)
     return app.openapi_schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="File to write the schema to.")
+    args = parser.parse_args()
+
+    from backend.app.main import app
+
+    with open(args.output, "w") as schema_file:
+        json.dump(build_openapi(app), schema_file)
+    print(f"Wrote OpenAPI schema to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
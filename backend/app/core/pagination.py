@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+def encode_cursor(sort_key: str, value, last_id: int) -> str:
+    """
+    Encode the position of the last row of a page into an opaque cursor.
+
+    :param sort_key: The sort key the page was ordered by.
+    :param value: The sort key value of the last row.
+    :param last_id: The ID of the last row (tie-breaker).
+    :return: URL-safe cursor string.
+    """
+    payload = json.dumps({"k": sort_key, "v": value, "i": last_id}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str):
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    :param cursor: The opaque cursor string.
+    :param sort_key: The sort key of the current request; must match the cursor.
+    :return: Tuple of (value, last_id).
+    :raises InvalidCursorError: If the cursor is malformed or was issued for another sort key.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, value, last_id = payload["k"], payload["v"], payload["i"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Malformed cursor.")
+    if key != sort_key:
+        raise InvalidCursorError("Cursor was issued for a different sort order.")
+    # Sort values are scalars; anything else would only fail inside the query
+    if not isinstance(last_id, int) or not isinstance(value, (str, int, float, type(None))):
+        raise InvalidCursorError("Malformed cursor.")
+    return value, last_id
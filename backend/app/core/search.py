@@ -0,0 +1,32 @@
+import re
+
+
+class InvalidSearchError(ValueError):
+    """
+    Raised when a search query contains no searchable terms.
+    """
+
+
+# Runs of letters/digits; everything else separates terms, as in the FTS5 tokenizer
+_TERM = re.compile(r"\w+\*?")
+
+
+def match_expression(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted phrase, so user input can never be parsed as
+    FTS5 syntax; all words must match. A trailing `*` keeps prefix matching
+    (e.g. "tolk*").
+
+    :param query: Text typed by the user.
+    :return: The MATCH expression.
+    :raises InvalidSearchError: If the query has no words.
+    """
+    phrases = []
+    for term in _TERM.findall(query):
+        prefix = term.endswith("*")
+        phrases.append(f'"{term.rstrip("*")}"' + ("*" if prefix else ""))
+    if not phrases:
+        raise InvalidSearchError("Query parameter 'q' must contain at least one word.")
+    return " ".join(phrases)
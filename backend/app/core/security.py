@@ -1,3 +1,7 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import jwt, JWTError, ExpiredSignatureError
 from passlib.context import CryptContext
@@ -5,6 +9,7 @@ from backend.app.core.config import settings
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from backend.app.core.sse import add_event  # Import add_event for SSE
+from backend.app.core.metrics import register_metrics
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -42,16 +47,84 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return encoded_jwt
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified token payloads, keyed by the SHA-256 of the token.
+
+    An entry is only served until the token's `exp`; after that the token goes
+    through `jwt.decode` again, which rejects it as expired. Tokens without an
+    `exp` are never cached.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # digest -> (exp, payload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] <= time.time():
+                self._entries.pop(digest, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (exp, dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.TOKEN_CACHE_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+register_metrics("token_cache", token_cache.stats)
+
+
 def verify_access_token(token: str = Depends(oauth2_scheme)) -> dict:
     """
     Verifies the validity of a JWT token.
+    Payloads of verified tokens are cached until they expire (TOKEN_CACHE_ENABLED).
 
     :param token: JWT token from the Authorization header.
     :return: Decoded token payload if valid.
     :raises HTTPException: If the token is invalid or expired.
     """
+    if settings.TOKEN_CACHE_ENABLED:
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if settings.TOKEN_CACHE_ENABLED:
+            token_cache.put(token, payload)
         return payload
     except ExpiredSignatureError:
         # Trigger event for expired token
@@ -1,12 +1,348 @@
-from queue import Queue, Empty
+import asyncio
 import json
+import logging
+import threading
+import time
+from collections import deque
+from backend.app.core.config import settings
+from backend.app.core.metrics import register_metrics
+from backend.app.core.event_bus import create_event_bus
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """
+    One SSE client's view of the event stream: a bounded ring of pending events.
+    When the ring is full the oldest event is dropped and counted as lag.
+    """
+
+    def __init__(self, maxsize: int, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue = deque(maxlen=maxsize)
+        # Below every event ID, so a resync-required event with ID 0 still gets through
+        self.last_id = -1
+        self.delivered = 0
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: dict):
+        """
+        Append an event; must be called on the subscriber's event loop.
+        Events already replayed to this subscriber are skipped.
+        """
+        event_id = event.get("id")
+        if event_id is not None:
+            if event_id <= self.last_id:
+                return
+            self.last_id = event_id
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(event)
+        self._wakeup.set()
+
+    async def drain(self, timeout: float) -> list:
+        """
+        Wait up to `timeout` seconds for events and return all pending ones.
+        :return: Pending events, or an empty list if none arrived in time.
+        """
+        if not self.queue:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        events = list(self.queue)
+        self.queue.clear()
+        self.delivered += len(events)
+        return events
+
+
+class ReplayLog:
+    """
+    Bounded, time-limited history of published events, kept so reconnecting
+    clients can resume from their Last-Event-ID. Not thread-safe on its own;
+    the broadcaster serializes access.
+    """
+
+    def __init__(self, max_size: int, max_age_seconds: float, start_id: int = 0):
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+        self._entries = deque()  # (published at, event)
+        self.last_id = start_id
+        # Events with an ID at or below the horizon may be missing from the log
+        self.horizon = start_id
+
+    def reset(self, start_id: int):
+        """
+        Forget all entries and continue numbering after `start_id`.
+        """
+        self._entries.clear()
+        self.last_id = start_id
+        self.horizon = start_id
+
+    def append(self, event: dict):
+        if event["id"] <= self.last_id:
+            return  # already recorded, e.g. an event bus retrying a batch
+        if self.max_size <= 0:
+            self.horizon = event["id"]
+        else:
+            if len(self._entries) >= self.max_size:
+                self.horizon = self._entries.popleft()[1]["id"]
+            self._entries.append((time.monotonic(), event))
+        self.last_id = event["id"]
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.max_age_seconds
+        while self._entries and self._entries[0][0] < cutoff:
+            self.horizon = self._entries.popleft()[1]["id"]
+
+    def since(self, last_event_id: int):
+        """
+        Events published after `last_event_id`.
+        :return: List of events, or None if some of them are no longer retained.
+        """
+        self._expire()
+        if last_event_id < self.horizon or last_event_id > self.last_id:
+            # Either evicted, or not an ID this log has issued (e.g. from before a restart)
+            return None
+        return [event for _, event in self._entries if event["id"] > last_event_id]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class EventBroadcaster:
+    """
+    Fans every published event out to all subscribers.
+
+    `publish` is safe to call from any thread and never blocks: events are
+    handed to each subscriber's event loop with one callback per loop.
+    Events carrying an "id" are also recorded in the replay log.
+    """
+
+    def __init__(self, subscriber_queue_size: int, replay_log: ReplayLog = None):
+        self.subscriber_queue_size = subscriber_queue_size
+        self.replay_log = replay_log if replay_log is not None else ReplayLog(max_size=0, max_age_seconds=0)
+        self._lock = threading.Lock()
+        self._subscribers = {}  # event loop -> set of subscribers on that loop
+
+    def subscribe(self, last_event_id: int = None) -> Subscriber:
+        """
+        Register a subscriber on the running event loop.
+
+        :param last_event_id: ID of the last event the client saw. Events
+            published after it are queued first; if they are no longer in the
+            replay log a "resync-required" event is queued instead.
+        """
+        loop = asyncio.get_running_loop()
+        subscriber = Subscriber(self.subscriber_queue_size, loop)
+        with self._lock:
+            # Register and snapshot under one lock so no event falls between
+            # the replay and live delivery; duplicates are skipped by ID.
+            self._subscribers.setdefault(loop, set()).add(subscriber)
+            missed = self.replay_log.since(last_event_id) if last_event_id is not None else []
+            latest_id = self.replay_log.last_id
+        if missed is None:
+            subscriber.push({
+                "id": latest_id,
+                "type": "resync-required",
+                "message": "Missed events are no longer available; reload the book list.",
+                "data": {"last_event_id": last_event_id},
+            })
+        else:
+            for event in missed:
+                subscriber.push(event)
+        return subscriber
+
+    def restore(self, start_id: int, events: list):
+        """
+        Reset the replay log to continue after `start_id` and record `events`
+        (published before this process started) as history. They are not
+        delivered to subscribers.
+        """
+        with self._lock:
+            self.replay_log.reset(start_id)
+            for event in events:
+                self.replay_log.append(event)
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.loop)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.loop]
+
+    def publish(self, event: dict):
+        self.publish_many([event])
+
+    def publish_many(self, events: list):
+        with self._lock:
+            for event in events:
+                if "id" in event:
+                    self.replay_log.append(event)
+            loops = list(self._subscribers)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for loop in loops:
+            if loop is running:
+                self._fan_out(loop, events)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._fan_out, loop, events)
+            except RuntimeError:
+                # The loop has been closed; its subscribers are gone
+                with self._lock:
+                    self._subscribers.pop(loop, None)
+
+    def _fan_out(self, loop: asyncio.AbstractEventLoop, events: list):
+        with self._lock:
+            subscribers = list(self._subscribers.get(loop, ()))
+        for subscriber in subscribers:
+            for event in events:
+                subscriber.push(event)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = [s for group in self._subscribers.values() for s in group]
+        return {
+            "subscribers": len(subscribers),
+            "replay_log_size": len(self.replay_log),
+            "last_event_id": self.replay_log.last_id,
+            "lag": [
+                {"pending": len(s.queue), "delivered": s.delivered, "dropped": s.dropped}
+                for s in subscribers
+            ],
+        }
+
+
+class EventDispatcher:
+    """
+    Decouples event emission from delivery.
+
+    `submit` only appends to a bounded buffer, so request handlers never wait
+    on streaming. A background thread drains the buffer in batches and hands
+    each batch to the event bus, which numbers the events and delivers them to
+    the broadcaster of every worker. When the buffer is full the overflow policy
+    decides which event is lost: "drop_oldest" evicts the oldest pending event,
+    "drop_newest" discards the incoming one.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, bus, buffer_size: int, batch_size: int, overflow_policy: str = "drop_oldest"):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.bus = bus
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self._buffer = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopping = False
+        self.submitted = 0
+        self.dispatched = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def submit(self, event: dict):
+        """
+        Queue an event for delivery. O(1) and never blocks on consumers.
+        """
+        with self._lock:
+            self.submitted += 1
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+                if self.overflow_policy == "drop_newest":
+                    return
+            self._buffer.append(event)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sse-dispatcher", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _take_batch(self) -> list:
+        with self._lock:
+            count = min(len(self._buffer), self.batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            batch = self._take_batch()
+            while batch:
+                try:
+                    self.bus.publish_many(batch)
+                    self.dispatched += len(batch)
+                except Exception as e:
+                    logger.warning("Failed to dispatch %d events: %s", len(batch), e)
+                    self.failed += len(batch)
+                self.batches += 1
+                batch = self._take_batch()
+            if self._stopping:
+                return
+
+    def close(self, timeout: float = 2.0):
+        """
+        Deliver what is still buffered and stop the dispatcher thread.
+        A later `submit` starts a new thread.
+        """
+        with self._lock:
+            self._stopping = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            self._stopping = False
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._buffer),
+            "submitted": self.submitted,
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "overflow_policy": self.overflow_policy,
+        }
+
+
+broadcaster = EventBroadcaster(
+    settings.SSE_SUBSCRIBER_QUEUE_SIZE,
+    ReplayLog(settings.EVENT_REPLAY_BUFFER_SIZE, settings.EVENT_REPLAY_MAX_AGE_SECONDS),
+)
+event_bus = create_event_bus(
+    settings.EVENT_BUS_BACKEND,
+    broadcaster,
+    # In-process event IDs start from the wall clock (ms) so they keep increasing across restarts
+    start_id=int(time.time() * 1000),
+    path=settings.EVENT_BUS_PATH,
+    poll_interval=settings.EVENT_BUS_POLL_INTERVAL_SECONDS,
+    retention_seconds=settings.EVENT_BUS_RETENTION_SECONDS,
+    backlog=settings.EVENT_REPLAY_BUFFER_SIZE,
+)
+dispatcher = EventDispatcher(
+    event_bus,
+    buffer_size=settings.EVENT_BUFFER_SIZE,
+    batch_size=settings.EVENT_BATCH_SIZE,
+    overflow_policy=settings.EVENT_OVERFLOW_POLICY,
+)
+register_metrics("sse", broadcaster.stats)
+register_metrics("events", dispatcher.stats)
+register_metrics("event_bus", event_bus.stats)
 
-# Event queue with a maximum size to prevent unbounded growth
-event_queue = Queue(maxsize=100)
 
 def add_event(event_type: str, message: str, data: dict = None):
     """
-    Add an event to the queue with type and optional data.
+    Queue an event for every connected SSE client without blocking the caller.
     :param event_type: The type of event (e.g., 'book-created', 'error').
     :param message: A message describing the event.
     :param data: Additional data for the event (optional).
@@ -17,27 +353,38 @@ def add_event(event_type: str, message: str, data: dict = None):
             "message": message,
             "data": data or {}
         }
-        event_queue.put(event, timeout=2)  # Timeout ensures no indefinite blocking
+        dispatcher.submit(event)
     except Exception as e:
-        print(f"Failed to add event to queue: {str(e)}")
+        print(f"Failed to add event: {str(e)}")
+
 
-def generate_stream():
+def format_event(event: dict) -> str:
+    prefix = f"id: {event['id']}\n" if "id" in event else ""
+    return f"{prefix}event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def generate_stream(last_event_id: int = None):
     """
-    Generator function for streaming events from the queue.
-    Yields events in SSE format.
+    Async generator streaming events to one client in SSE format.
+    Holds no worker thread while idle; sends keep-alives between events.
+    :param last_event_id: Resume after this event ID (from the Last-Event-ID header).
     """
+    event_bus.start()
+    subscriber = broadcaster.subscribe(last_event_id)
     try:
         while True:
-            try:
-                # Wait for an event with a timeout
-                event = event_queue.get(timeout=10)
-                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
-            except Empty:
+            events = await subscriber.drain(settings.SSE_KEEPALIVE_SECONDS)
+            if events:
+                yield "".join(format_event(event) for event in events)
+            else:
                 # Send a keep-alive message to prevent client timeouts
                 yield ": keep-alive\n\n"
-    except GeneratorExit:
+    except asyncio.CancelledError:
         # Handle client disconnection gracefully
         print("Client disconnected from SSE stream.")
+        raise
     except Exception as e:
         # Log unexpected errors
         print(f"Error in SSE stream: {str(e)}")
+    finally:
+        broadcaster.unsubscribe(subscriber)
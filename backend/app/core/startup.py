@@ -0,0 +1,79 @@
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from importlib.machinery import PathFinder
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """
+    Records how long each application module takes to import and each
+    startup step takes to run, and logs them as one report.
+    """
+
+    def __init__(self):
+        self.imports = []  # (module, cumulative seconds, self seconds) in import order
+        self.steps = []  # (step, seconds)
+        self._stack = []  # child time accumulated by each import in progress
+
+    def _timed_exec(self, name: str, exec_module):
+        def exec_timed(module):
+            self._stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                self.imports.append((name, elapsed, elapsed - children))
+
+        return exec_timed
+
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started))
+
+    def report(self):
+        lines = ["Startup profile", f"{'import':<48} {'cumulative ms':>14} {'self ms':>8}"]
+        for name, cumulative, own in sorted(self.imports, key=lambda entry: -entry[1]):
+            lines.append(f"{name:<48} {cumulative * 1000:>14.1f} {own * 1000:>8.1f}")
+        lines.append(f"{'startup step':<48} {'ms':>14}")
+        for name, elapsed in self.steps:
+            lines.append(f"{name:<48} {elapsed * 1000:>14.1f}")
+        logger.info("\n".join(lines))
+
+
+class _TimingFinder(MetaPathFinder):
+    """
+    Finds modules under `prefix` like the default path finder, timing their execution.
+    """
+
+    def __init__(self, profile: StartupProfile, prefix: str):
+        self.profile = profile
+        self.prefix = prefix
+
+    def find_spec(self, name, path, target=None):
+        if not name.startswith(self.prefix):
+            return None
+        spec = PathFinder.find_spec(name, path, target)
+        if spec is not None and spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader.exec_module = self.profile._timed_exec(name, spec.loader.exec_module)
+        return spec
+
+
+def profile_imports(prefix: str = "backend.") -> StartupProfile:
+    """
+    Start timing every module imported under `prefix` from now on.
+    """
+    profile = StartupProfile()
+    sys.meta_path.insert(0, _TimingFinder(profile, prefix))
+    return profile
@@ -1,10 +1,140 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from backend.app.core.config import settings
 
-print(settings.DATABASE_URL)  # Should output the correct absolute path to books.db
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def async_database_url(url: str) -> str:
+    """
+    Derive the asyncio driver URL for a database URL (sqlite -> sqlite+aiosqlite).
+    """
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS_LEVELS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+def sqlite_pragmas(journal_mode: str, synchronous: str, mmap_size: int, cache_size: int,
+                   busy_timeout_ms: int, temp_store: str) -> list:
+    """
+    Build the PRAGMA statements for a tuning profile.
+    :raises ValueError: If a mode is not one SQLite knows.
+    """
+    for value, allowed, name in (
+        (journal_mode, _JOURNAL_MODES, "journal mode"),
+        (synchronous, _SYNCHRONOUS_LEVELS, "synchronous level"),
+        (temp_store, _TEMP_STORES, "temp_store"),
+    ):
+        if value.upper() not in allowed:
+            raise ValueError(f"Unknown SQLite {name}: {value}")
+    # busy_timeout first, so switching the journal mode waits out other connections
+    return [
+        f"PRAGMA busy_timeout = {int(busy_timeout_ms)}",
+        f"PRAGMA journal_mode = {journal_mode.upper()}",
+        f"PRAGMA synchronous = {synchronous.upper()}",
+        f"PRAGMA mmap_size = {int(mmap_size)}",
+        f"PRAGMA cache_size = {int(cache_size)}",
+        f"PRAGMA temp_store = {temp_store.upper()}",
+    ]
+
+
+def configured_pragmas() -> list:
+    return sqlite_pragmas(
+        settings.SQLITE_JOURNAL_MODE,
+        settings.SQLITE_SYNCHRONOUS,
+        settings.SQLITE_MMAP_SIZE,
+        settings.SQLITE_CACHE_SIZE,
+        settings.SQLITE_BUSY_TIMEOUT_MS,
+        settings.SQLITE_TEMP_STORE,
+    )
+
+
+def tune_sqlite(engine, pragmas: list):
+    """
+    Run `pragmas` on every new DBAPI connection the (sync) engine's pool opens.
+    Does nothing for other databases.
+    """
+    if not engine.url.drivername.startswith("sqlite"):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# Engines are created on first use rather than at import, keeping imports cheap
+@lru_cache(maxsize=None)
+def get_engine():
+    engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+    tune_sqlite(engine, configured_pragmas())
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_engine():
+    engine = create_async_engine(async_database_url(settings.DATABASE_URL))
+    tune_sqlite(engine.sync_engine, configured_pragmas())
+    return engine
+
+
+class _Session(Session):
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(bind=bind or get_engine(), **kwargs)
+
+
+class _AsyncSession(AsyncSession):
+    def __init__(self, bind=None, **kwargs):
+        super().__init__(bind=bind or get_async_engine(), **kwargs)
+
+
+SessionLocal = sessionmaker(class_=_Session, autocommit=False, autoflush=False)
+# Objects stay loaded after commit so handlers never trigger implicit (sync) refreshes
+AsyncSessionLocal = async_sessionmaker(class_=_AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
+
+
+def __getattr__(name: str):
+    # `engine` and `async_engine` stay importable as module attributes
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def init_db():
+    """
+    Bring the database schema up to date by applying pending migrations.
+    """
+    from backend.app.db.migrations import migrate
+
+    migrate(get_engine().url.database, batch_size=settings.MIGRATION_BATCH_SIZE)
+
+
+def rebuild_search_index():
+    """
+    Recreate the full-text index from the books table and compact it.
+    """
+    from backend.app.db.migrations import BOOK_SEARCH_REBUILD, connect, create_search_index, transaction
+
+    connection = connect(get_engine().url.database)
+    try:
+        with transaction(connection):
+            create_search_index(connection)
+            connection.execute(BOOK_SEARCH_REBUILD)
+            connection.execute("INSERT INTO books_fts (books_fts) VALUES ('optimize')")
+    finally:
+        connection.close()
@@ -0,0 +1,360 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+The schema version is kept in `PRAGMA user_version`. Each migration moves
+the schema up by one version and runs on a plain sqlite3 connection, so it
+controls its own transactions: most run in a single `BEGIN IMMEDIATE`, and
+long data migrations commit in batches to keep the write lock short. Every
+step checks the schema before changing it, so a migration interrupted
+part-way (or raced by another worker starting up) can simply run again.
+
+    python -m backend.app.db.migrations status
+    python -m backend.app.db.migrations upgrade [--target VERSION]
+"""
+import argparse
+import logging
+import sqlite3
+from collections import namedtuple
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+Migration = namedtuple("Migration", ["version", "description", "apply"])
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    """
+    Register `fn(connection, batch_size)` as the migration to `version`.
+    """
+    def register(fn):
+        assert version == len(MIGRATIONS) + 1, "migrations must be numbered consecutively"
+        MIGRATIONS.append(Migration(version, description, fn))
+        return fn
+    return register
+
+
+@contextmanager
+def transaction(connection: sqlite3.Connection):
+    """
+    Run a block in a write transaction (taking the write lock up front).
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _columns(connection: sqlite3.Connection, table: str) -> dict:
+    """
+    :return: Mapping of column name to declared type.
+    """
+    return {row[1]: row[2].upper() for row in connection.execute(f"PRAGMA table_info({table})")}
+
+
+def _table_exists(connection: sqlite3.Connection, name: str) -> bool:
+    return connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+@migration(1, "books and books_meta tables")
+def _create_tables(connection, batch_size):
+    with transaction(connection):
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                published_date TEXT,
+                summary TEXT,
+                genre TEXT NOT NULL
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS books_meta (
+                "key" VARCHAR NOT NULL PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+
+# Triggers keep the 'book_count' row current for every write path, including
+# bulk statements. They are created before the row is seeded so an insert
+# racing with initialization is never lost.
+BOOK_COUNT_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS books_count_insert AFTER INSERT ON books
+    BEGIN
+        UPDATE books_meta SET value = value + 1 WHERE key = 'book_count';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_count_delete AFTER DELETE ON books
+    BEGIN
+        UPDATE books_meta SET value = value - 1 WHERE key = 'book_count';
+    END
+    """,
+    "INSERT OR IGNORE INTO books_meta (key, value) SELECT 'book_count', COUNT(*) FROM books",
+]
+
+
+@migration(2, "trigger-maintained book count")
+def _book_count(connection, batch_size):
+    with transaction(connection):
+        for statement in BOOK_COUNT_DDL:
+            connection.execute(statement)
+
+
+# Single-column indexes are ordered by (column, id), matching every sort key;
+# the composites let an author or genre filter seek on a date range too
+BOOK_DATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_books_published_date ON books (published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_books_author_published_date ON books (author, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_books_genre_published_date ON books (genre, published_date)",
+]
+BOOK_LIST_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_books_title ON books (title)",
+    "CREATE INDEX IF NOT EXISTS ix_books_author ON books (author)",
+    "CREATE INDEX IF NOT EXISTS ix_books_genre ON books (genre)",
+] + BOOK_DATE_INDEXES
+
+
+@migration(3, "indexes for listing filters and sorts")
+def _list_indexes(connection, batch_size):
+    with transaction(connection):
+        for statement in BOOK_LIST_INDEXES:
+            connection.execute(statement)
+
+
+# External-content FTS5 index over the searchable columns; rows are read back
+# from `books`, so the index only stores tokens. Porter stemming lets "running"
+# match "run", and prefix indexes keep "tol*"-style queries cheap.
+BOOK_SEARCH_TABLE_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, summary,
+        content='books', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+"""
+
+# Triggers mirror every write to `books` into the index, including bulk statements
+BOOK_SEARCH_TRIGGERS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books
+    BEGIN
+        INSERT INTO books_fts (rowid, title, author, summary)
+        VALUES (new.id, new.title, new.author, new.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books
+    BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, summary)
+        VALUES ('delete', old.id, old.title, old.author, old.summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_update AFTER UPDATE OF title, author, summary ON books
+    BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, summary)
+        VALUES ('delete', old.id, old.title, old.author, old.summary);
+        INSERT INTO books_fts (rowid, title, author, summary)
+        VALUES (new.id, new.title, new.author, new.summary);
+    END
+    """,
+]
+
+# Re-reads every row of `books`; needed when the index is first added to an existing database
+BOOK_SEARCH_REBUILD = "INSERT INTO books_fts (books_fts) VALUES ('rebuild')"
+
+
+def create_search_index(connection: sqlite3.Connection):
+    """
+    Create the FTS5 index and its sync triggers if missing, building it when new.
+    Must run inside a transaction.
+    """
+    exists = _table_exists(connection, "books_fts")
+    connection.execute(BOOK_SEARCH_TABLE_DDL)
+    for statement in BOOK_SEARCH_TRIGGERS_DDL:
+        connection.execute(statement)
+    if not exists:
+        connection.execute(BOOK_SEARCH_REBUILD)
+
+
+@migration(4, "full-text search index")
+def _search_index(connection, batch_size):
+    with transaction(connection):
+        create_search_index(connection)
+
+
+# While the backfill runs, writes from other processes keep the new column current
+_PUBLISHED_ON_SYNC_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS books_published_on_insert AFTER INSERT ON books
+    BEGIN
+        UPDATE books SET published_on = date(new.published_date) WHERE id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_published_on_update AFTER UPDATE OF published_date ON books
+    BEGIN
+        UPDATE books SET published_on = date(new.published_date) WHERE id = new.id;
+    END
+    """,
+]
+
+
+@migration(5, "published_date as DATE")
+def _published_date_as_date(connection, batch_size):
+    """
+    Move published_date from TEXT to a DATE column holding canonical
+    YYYY-MM-DD values (values SQLite cannot read as a date become NULL):
+
+    1. add `published_on DATE`, with triggers copying concurrent writes into it;
+    2. backfill it in id ranges of `batch_size`, one short transaction each;
+    3. swap it in for the old column and rebuild the date indexes.
+
+    Only the swap holds the write lock for longer than a batch.
+    """
+    with transaction(connection):
+        columns = _columns(connection, "books")
+        if columns.get("published_date") == "DATE":
+            return
+        if "published_on" not in columns:
+            connection.execute("ALTER TABLE books ADD COLUMN published_on DATE")
+        for statement in _PUBLISHED_ON_SYNC_DDL:
+            connection.execute(statement)
+        last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+
+    for start in range(0, last_id, batch_size):
+        with transaction(connection):
+            connection.execute(
+                "UPDATE books SET published_on = date(published_date) WHERE id > ? AND id <= ?",
+                (start, start + batch_size),
+            )
+        logger.info("published_date backfill: %d/%d", min(start + batch_size, last_id), last_id)
+
+    with transaction(connection):
+        if "published_on" not in _columns(connection, "books"):
+            return
+        connection.execute("DROP TRIGGER IF EXISTS books_published_on_insert")
+        connection.execute("DROP TRIGGER IF EXISTS books_published_on_update")
+        for name in ("ix_books_published_date", "ix_books_author_published_date", "ix_books_genre_published_date"):
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+        connection.execute("ALTER TABLE books DROP COLUMN published_date")
+        connection.execute("ALTER TABLE books RENAME COLUMN published_on TO published_date")
+        for statement in BOOK_DATE_INDEXES:
+            connection.execute(statement)
+
+
+# `books_changes` counts every write to the table (the ETag of list pages).
+# Application writes bump `version` themselves in their Core UPDATEs
+# (SET version = version + 1); the last trigger bumps it for any other UPDATE
+# that leaves it alone.
+BOOK_VERSION_DDL = [
+    "INSERT OR IGNORE INTO books_meta (key, value) VALUES ('books_changes', 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS books_changes_insert AFTER INSERT ON books
+    BEGIN
+        UPDATE books_meta SET value = value + 1 WHERE key = 'books_changes';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_changes_update AFTER UPDATE ON books
+    BEGIN
+        UPDATE books_meta SET value = value + 1 WHERE key = 'books_changes';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_changes_delete AFTER DELETE ON books
+    BEGIN
+        UPDATE books_meta SET value = value + 1 WHERE key = 'books_changes';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_version_update AFTER UPDATE ON books
+    WHEN new.version = old.version
+    BEGIN
+        UPDATE books SET version = old.version + 1 WHERE id = new.id;
+    END
+    """,
+]
+
+
+@migration(6, "row versions and table change counter")
+def _row_versions(connection, batch_size):
+    # Adding a column with a constant default does not rewrite the table
+    with transaction(connection):
+        if "version" not in _columns(connection, "books"):
+            connection.execute("ALTER TABLE books ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        for statement in BOOK_VERSION_DDL:
+            connection.execute(statement)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    # Autocommit mode: migrations issue BEGIN/COMMIT themselves
+    return sqlite3.connect(path, timeout=30, isolation_level=None)
+
+
+def current_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(path: str, target: int = None, batch_size: int = 10000) -> list:
+    """
+    Apply pending migrations to the database at `path`, up to `target` (default: latest).
+    :return: Versions applied.
+    """
+    target = MIGRATIONS[-1].version if target is None else target
+    applied = []
+    connection = connect(path)
+    try:
+        for step in MIGRATIONS:
+            if step.version <= current_version(connection) or step.version > target:
+                continue
+            logger.info("Applying migration %d: %s", step.version, step.description)
+            step.apply(connection, batch_size)
+            with transaction(connection):
+                # Another worker may have finished this migration meanwhile; never go backwards
+                if current_version(connection) < step.version:
+                    connection.execute(f"PRAGMA user_version = {step.version}")
+            applied.append(step.version)
+    finally:
+        connection.close()
+    return applied
+
+
+def main():
+    from backend.app.core.config import settings
+    from backend.app.db.database import get_engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--target", type=int, help="Version to upgrade to (default: latest).")
+    parser.add_argument("--batch-size", type=int, default=settings.MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    path = get_engine().url.database
+    if args.command == "upgrade":
+        applied = migrate(path, args.target, args.batch_size)
+        print(f"Applied migrations: {applied or 'none'}")
+    connection = connect(path)
+    try:
+        version = current_version(connection)
+    finally:
+        connection.close()
+    print(f"{path}: schema version {version} of {MIGRATIONS[-1].version}")
+    for step in MIGRATIONS:
+        if step.version > version:
+            print(f"  pending {step.version}: {step.description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,36 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Date, Index, Integer, String
 from backend.app.db.database import Base
 
 class Book(Base):
+    """
+    A book. The schema itself is created and evolved by `db/migrations.py`.
+    """
     __tablename__ = "books"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
-    author = Column(String, nullable=False)
-    published_date = Column(Text, nullable=True)
+    id = Column(Integer, primary_key=True)
+    # Single-column indexes are ordered by (column, id), matching every sort key
+    title = Column(String, nullable=False, index=True)
+    author = Column(String, nullable=False, index=True)
+    published_date = Column(Date, nullable=True, index=True)
     summary = Column(String, nullable=True)
-    genre = Column(String, nullable=False)
+    genre = Column(String, nullable=False, index=True)
+    # Bumped on every update: the services' Core UPDATEs set version = version + 1 and
+    # a trigger covers any other UPDATE. Conditional writes (If-Match) match on it.
+    version = Column(Integer, nullable=False, default=1)
+
+    # An author or genre filter combined with a date range (or date sort) seeks on both columns
+    __table_args__ = (
+        Index("ix_books_author_published_date", "author", "published_date"),
+        Index("ix_books_genre_published_date", "genre", "published_date"),
+    )
+
+
+class BooksMeta(Base):
+    """
+    Key/value counters about the books table, maintained by triggers.
+    """
+    __tablename__ = "books_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
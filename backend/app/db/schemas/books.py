@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Any
 from datetime import date
 
 
@@ -53,6 +53,14 @@ class BookPatch(BaseModel):
     summary: Optional[str] = None
     genre: Optional[str] = None
 
+    @field_validator("title", "author", "genre")
+    @classmethod
+    def not_null(cls, value):
+        # Omit a field to leave it unchanged; these columns cannot be cleared
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -62,6 +70,21 @@ class BookPatch(BaseModel):
         }
 
 
+class BookBulkPatch(BookPatch):
+    """
+    Schema for one item of a bulk partial update: the book ID plus the fields to change.
+    """
+    id: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 1,
+                "genre": "Classics"
+            }
+        }
+
+
 class Book(BookBase):
     """
     Schema representing a complete book with an ID.
@@ -87,9 +110,10 @@ class BooksResponse(BaseModel):
     Response schema for retrieving a list of books.
     """
     items: List[Book]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
     class Config:
         json_schema_extra = {
@@ -114,6 +138,44 @@ class BooksResponse(BaseModel):
                 ],
                 "total": 2,
                 "skip": 0,
+                "limit": 10,
+                "next_cursor": None
+            }
+        }
+
+
+class SearchResult(Book):
+    """
+    A book matching a full-text search, with its relevance and a highlighted excerpt.
+    """
+    score: float
+    snippet: str
+
+
+class SearchResponse(BaseModel):
+    """
+    Response schema for a full-text search, best matches first.
+    """
+    items: List[SearchResult]
+    skip: int
+    limit: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "id": 2,
+                        "title": "To Kill a Mockingbird",
+                        "author": "Harper Lee",
+                        "published_date": "1960-07-11",
+                        "summary": "A novel about racism and injustice.",
+                        "genre": "Fiction",
+                        "score": 4.21,
+                        "snippet": "To Kill a <mark>Mockingbird</mark>"
+                    }
+                ],
+                "skip": 0,
                 "limit": 10
             }
         }
@@ -140,6 +202,125 @@ class BookCreatedResponse(BaseModel):
         }
 
 
+class BulkItemResult(BaseModel):
+    """
+    Outcome of one item of a bulk request, in request order.
+    """
+    index: int
+    status: str
+    id: Optional[int] = None
+    detail: Optional[str] = None
+    errors: Optional[List[Any]] = None
+
+
+class BulkResponse(BaseModel):
+    """
+    Response schema for bulk create, update and delete.
+    """
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {"index": 0, "status": "created", "id": 4},
+                    {
+                        "index": 1,
+                        "status": "invalid",
+                        "errors": [{"type": "missing", "loc": ["title"], "msg": "Field required"}]
+                    }
+                ],
+                "succeeded": 1,
+                "failed": 1
+            }
+        }
+
+
+class BatchRequest(BaseModel):
+    """
+    Request schema for looking up many books by ID.
+    """
+    ids: List[int]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ids": [3, 1, 42]
+            }
+        }
+
+
+class BatchResponse(BaseModel):
+    """
+    Response schema for a batch lookup: found books in request order, and the IDs with no book.
+    """
+    items: List[Book]
+    missing: List[int]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "id": 3,
+                        "title": "1984",
+                        "author": "George Orwell",
+                        "published_date": "1949-06-08",
+                        "summary": "A dystopian novel about a totalitarian regime.",
+                        "genre": "Dystopian Fiction"
+                    },
+                    {
+                        "id": 1,
+                        "title": "The Great Gatsby",
+                        "author": "F. Scott Fitzgerald",
+                        "published_date": "1925-04-10",
+                        "summary": "A novel about the American dream.",
+                        "genre": "Fiction"
+                    }
+                ],
+                "missing": [42]
+            }
+        }
+
+
+class ImportRowError(BaseModel):
+    """
+    Why one imported row was rejected.
+    """
+    row: int
+    errors: Any
+
+
+class ImportResponse(BaseModel):
+    """
+    Summary of a streaming import.
+    """
+    rows: int
+    imported: int
+    failed: int
+    batches: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
+    elapsed_seconds: float
+    rows_per_second: Optional[int] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "rows": 3,
+                "imported": 2,
+                "failed": 1,
+                "batches": 1,
+                "errors": [{"row": 2, "errors": [{"type": "missing", "loc": ["title"], "msg": "Field required"}]}],
+                "errors_truncated": False,
+                "elapsed_seconds": 0.012,
+                "rows_per_second": 250
+            }
+        }
+
+
 class SuccessResponse(BaseModel):
     """
     Generic success response model for operations like DELETE.
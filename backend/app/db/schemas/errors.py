@@ -46,6 +46,26 @@ class ValidationError(BaseModel):
             }
         }
 
+class PreconditionFailedError(BaseModel):
+    detail: str = Field(..., description="Details of the failed precondition.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "detail": "Book with ID 123 has been modified."
+            }
+        }
+
+class ServiceUnavailableError(BaseModel):
+    detail: str = Field(..., description="Why the request could not be served right now.")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "detail": "Too many requests are waiting; try again shortly."
+            }
+        }
+
 class InternalServerError(BaseModel):
     detail: str = Field(..., description="Details of the unexpected server error.")
 
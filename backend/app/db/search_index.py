@@ -0,0 +1,21 @@
+"""
+Build (or rebuild) the full-text search index of an existing database, e.g.
+the shipped books.db or one written to while the sync triggers were missing.
+
+    python -m backend.app.db.search_index
+"""
+import time
+
+from backend.app.core.config import settings
+from backend.app.db.database import init_db, rebuild_search_index
+
+
+def main():
+    started = time.perf_counter()
+    init_db()
+    rebuild_search_index()
+    print(f"Rebuilt the search index of {settings.DATABASE_URL} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
 import sys
 import os
-import uvicorn
+from contextlib import asynccontextmanager, nullcontext
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from backend.app.core.config import settings
+from backend.app.core.startup import profile_imports
+
+# Time the imports below when profiling startup
+startup_profile = profile_imports() if settings.STARTUP_PROFILE else None
+
+import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from backend.app.api.v1.routes import books, auth, sse
+from backend.app.api.v1.routes import books, auth, sse, metrics
 import logging
-from backend.app.db.database import SessionLocal
+from backend.app.db.database import get_engine, init_db
+from backend.app.core.sse import dispatcher, event_bus
 from backend.app.core.openapi import custom_openapi
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware import Middleware
@@ -29,33 +37,40 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         logger.debug(f"Response status: {response.status_code}")
         return response
 
-app = FastAPI(
-    title="Books API",
-    description="CRUD API for books with JWT authentication",
-    version="1.0.0",
-    middleware=[Middleware(LoggingMiddleware)]
-)
+def _startup_step(name: str):
+    return startup_profile.step(name) if startup_profile else nullcontext()
 
-@app.on_event("startup")
-async def startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     """
-    Runs during application startup. Use this to initialize resources.
+    Initializes resources on startup and cleans them up on shutdown.
     """
     logger.info("Starting up the application...")
-    db = SessionLocal()
-    try:
-        logger.info("Database connection initialized successfully.")
-    finally:
-        db.close()
-
-@app.on_event("shutdown")
-async def shutdown():
-    """
-    Runs during application shutdown. Use this to clean up resources.
-    """
+    with _startup_step("init_db"):
+        init_db()
+    with _startup_step("event_bus.start"):
+        event_bus.start()
+    with _startup_step("database connection"):
+        with get_engine().connect():
+            logger.info("Database connection initialized successfully.")
+    if startup_profile:
+        with _startup_step("openapi schema (otherwise built on the first /docs hit)"):
+            app.openapi()
+        startup_profile.report()
+    yield
     logger.info("Shutting down the application...")
+    dispatcher.close()
+    event_bus.close()
     logger.info("Resources cleaned up successfully.")
-    
+
+app = FastAPI(
+    title="Books API",
+    description="CRUD API for books with JWT authentication",
+    version="1.0.0",
+    middleware=[Middleware(LoggingMiddleware)],
+    lifespan=lifespan,
+)
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
@@ -92,6 +107,7 @@ async def generic_exception_handler(request: Request, exc: Exception):
 app.include_router(books.router, prefix="/v1/books", tags=["Books"])
 app.include_router(auth.router, prefix="/v1/auth", tags=["Authentication"])
 app.include_router(sse.router, prefix="/v1/stream", tags=["Real-Time Updates"])
+app.include_router(metrics.router, prefix="/v1/metrics", tags=["Metrics"])
 
 # Apply custom OpenAPI
 app.openapi = lambda: custom_openapi(app)
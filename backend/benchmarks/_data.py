@@ -0,0 +1,37 @@
+import os
+import sqlite3
+import tempfile
+
+
+def seed_database(rows: int, directory: str = None) -> str:
+    """
+    Create a SQLite database holding `rows` synthetic books and return its path.
+    Uses the raw sqlite3 driver so seeding millions of rows stays quick.
+    """
+    path = os.path.join(directory or tempfile.mkdtemp(prefix="books-bench-"), f"books-{rows}.db")
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE books (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, author TEXT NOT NULL, "
+        "published_date DATE, summary TEXT, genre TEXT NOT NULL)"
+    )
+    genres = ["Fiction", "Poetry", "History", "Science", "Fantasy", "Biography"]
+    batch = 50000
+    for start in range(0, rows, batch):
+        connection.executemany(
+            "INSERT INTO books (title, author, published_date, summary, genre) VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    f"Title {i}",
+                    f"Author {i % 5000}",
+                    f"{1900 + i % 120:04d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+                    f"Summary of book {i}. " * 4,
+                    genres[i % len(genres)],
+                )
+                for i in range(start, min(start + batch, rows))
+            ),
+        )
+        connection.commit()
+    connection.close()
+    return path
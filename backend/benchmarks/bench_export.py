@@ -0,0 +1,83 @@
+"""
+Peak memory of the streaming catalog export as the table grows.
+
+Each table size is exported in a fresh child process, which reports its
+resident set size before the export and its peak RSS after reading the
+whole stream. With a server-side cursor the peak should stay flat from
+10k to 10M rows.
+
+    python -m backend.benchmarks.bench_export --rows 10000 100000 1000000 10000000
+"""
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from backend.benchmarks._data import seed_database
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def export(export_format: str, mode: str):
+    """
+    Child process: drain the export generator and print memory figures.
+    """
+    from backend.app.api.v1.services.books import book_service, async_book_service
+
+    baseline = _rss_kb()
+    started = time.perf_counter()
+    total_bytes = 0
+    if mode == "async":
+        async def drain():
+            size = 0
+            async for chunk in async_book_service.export_books(export_format):
+                size += len(chunk)
+            return size
+        total_bytes = asyncio.run(drain())
+    else:
+        for chunk in book_service.export_books(export_format):
+            total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{baseline} {peak} {total_bytes} {elapsed:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv"])
+    parser.add_argument("--mode", default="sync", choices=["sync", "async"])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        export(args.format, args.mode)
+        return
+
+    print(f"{'rows':>10} {'baseline MB':>12} {'peak MB':>9} {'output MB':>10} {'seconds':>8} {'rows/s':>10}")
+    for rows in args.rows:
+        path = seed_database(rows)
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+        command = [sys.executable, "-m", "backend.benchmarks.bench_export", "--child",
+                   "--format", args.format, "--mode", args.mode]
+        output = subprocess.run(command, env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        baseline, peak, size, elapsed = output.stdout.split()[-4:]
+        elapsed = float(elapsed)
+        print(f"{rows:>10} {int(baseline) / 1024:>12.1f} {int(peak) / 1024:>9.1f} "
+              f"{int(size) / 2**20:>10.1f} {elapsed:>8.2f} {rows / elapsed:>10.0f}")
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Single-book create throughput with and without group commit.
+
+Runs `--concurrency` coroutines each creating books through the same
+service facades the routes use: one transaction per book (threadpool),
+then batched through the GroupCommitter. Run it under each SQLite
+synchronous level to see how much of a commit is the fsync:
+
+    python -m backend.benchmarks.bench_group_commit --books 5000 --concurrency 64
+    SQLITE_SYNCHRONOUS=FULL python -m backend.benchmarks.bench_group_commit
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from backend.benchmarks._data import seed_database
+
+
+async def _create(service, books: int, concurrency: int) -> float:
+    from backend.app.db.database import SessionLocal
+    from backend.app.db.schemas.books import BookCreate
+
+    queue = iter(range(books))
+
+    async def worker():
+        for i in queue:
+            await service.create_book(SessionLocal(), BookCreate(title=f"Title {i}", author="Author", genre="Fiction"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return books / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    path = seed_database(0)
+    # Settings are read on import, so point the app at the seeded database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from backend.app.core.config import settings
+    from backend.app.core.group_commit import GroupCommitter
+    from backend.app.core.sse import dispatcher
+    from backend.app.db.database import init_db
+    from backend.app.api.v1.services.books import BatchingBookService, ThreadedBookService, _write_batch, book_service
+
+    init_db()
+    committer = GroupCommitter(_write_batch, args.window_ms / 1000, args.batch_size)
+    print(f"synchronous={settings.SQLITE_SYNCHRONOUS}, {args.concurrency} concurrent writers")
+    print(f"{'path':>22} {'books/s':>9}")
+    threaded = ThreadedBookService(book_service)
+    for name, service in (("commit per book", threaded), ("group commit", BatchingBookService(threaded, committer))):
+        rate = asyncio.run(_create(service, args.books, args.concurrency))
+        print(f"{name:>22} {rate:>9.0f}")
+    print(f"mean batch: {committer.stats()['mean_batch']}")
+    dispatcher.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Throughput of the streaming import, in rows per second, by batch size.
+
+Each run imports synthetic NDJSON or CSV into an empty database in a fresh
+child process, driving the same parser and batch loop as POST /v1/books/import
+(the HTTP layer is skipped). Larger batches mean fewer commits; the summary
+also reports peak RSS, which should not grow with the number of rows.
+
+    python -m backend.benchmarks.bench_import --rows 100000 --batch-sizes 100 1000 10000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+GENRES = ["Fiction", "Poetry", "History", "Science", "Fantasy", "Biography"]
+
+
+def _book(i: int) -> dict:
+    return {
+        "title": f"Title {i}",
+        "author": f"Author {i % 5000}",
+        "published_date": f"{1900 + i % 120:04d}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "summary": f"Summary of book {i}. " * 4,
+        "genre": GENRES[i % len(GENRES)],
+    }
+
+
+async def _body(rows: int, import_format: str, chunk_size: int = 64 * 1024):
+    """
+    Yield the request body in fixed-size chunks, as an ASGI server would.
+    """
+    buffer = b""
+    if import_format == "csv":
+        buffer = b"title,author,published_date,summary,genre\n"
+    for i in range(rows):
+        book = _book(i)
+        if import_format == "csv":
+            line = ",".join(book.values()) + "\n"
+        else:
+            line = json.dumps(book) + "\n"
+        buffer += line.encode()
+        if len(buffer) >= chunk_size:
+            yield buffer[:chunk_size]
+            buffer = buffer[chunk_size:]
+    if buffer:
+        yield buffer
+
+
+def run_import(rows: int, import_format: str, batch_size: int, mode: str):
+    """
+    Child process: import into the empty database named by DATABASE_URL and print the summary.
+    """
+    from backend.app.db.database import init_db
+    from backend.app.core.ingest import RECORD_PARSERS
+    from backend.app.api.v1.services.books import (
+        async_book_service, book_service, ThreadedBookService, import_books,
+    )
+
+    init_db()
+    if mode == "async":
+        from backend.app.db.database import AsyncSessionLocal
+
+        async def main():
+            async with AsyncSessionLocal() as db:
+                records = RECORD_PARSERS[import_format](_body(rows, import_format))
+                return await import_books(async_book_service, db, records, batch_size)
+    else:
+        from backend.app.db.database import SessionLocal
+
+        async def main():
+            db = SessionLocal()
+            try:
+                records = RECORD_PARSERS[import_format](_body(rows, import_format))
+                return await import_books(ThreadedBookService(book_service), db, records, batch_size)
+            finally:
+                db.close()
+
+    summary = asyncio.run(main())
+    summary["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    summary.pop("errors")
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "csv"])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--batch-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_import(args.rows, args.format, args.batch_size, args.mode)
+        return
+
+    print(f"{'mode':>6} {'batch':>7} {'rows':>9} {'imported':>9} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+    for mode in args.modes:
+        for batch_size in args.batch_sizes:
+            path = os.path.join(tempfile.mkdtemp(prefix="books-bench-"), "books.db")
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", ASYNC_DATABASE=str(mode == "async").lower())
+            command = [sys.executable, "-m", "backend.benchmarks.bench_import", "--child", "--rows", str(args.rows),
+                       "--format", args.format, "--batch-size", str(batch_size), "--mode", mode]
+            output = subprocess.run(command, env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+            summary = json.loads(output.stdout.strip().splitlines()[-1])
+            print(f"{mode:>6} {batch_size:>7} {summary['rows']:>9} {summary['imported']:>9} "
+                  f"{summary['elapsed_seconds']:>8.2f} {summary['rows_per_second']:>9} "
+                  f"{summary['peak_rss_kb'] / 1024:>8.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
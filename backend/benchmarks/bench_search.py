@@ -0,0 +1,66 @@
+"""
+Latency of full-text search as the table grows.
+
+Seeds a database, builds the FTS5 index, then times each query through
+BookService.search_books and reports the median and p95 per query. Queries
+range from a rare exact word to a prefix matching most of the table, which
+is the worst case for ranking.
+
+    python -m backend.benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import os
+import statistics
+import time
+
+from backend.benchmarks._data import seed_database
+
+QUERIES = [
+    "Title 123456",        # two rare words, both required
+    "author 42",           # a common word and a rare one
+    "summary book",        # words present in every row
+    "tit*",                # prefix matching every row
+]
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--queries", nargs="+", default=QUERIES)
+    args = parser.parse_args()
+
+    path = seed_database(args.rows)
+    # Settings are read on import, so point the app at the seeded database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from backend.app.db.database import SessionLocal, init_db
+    from backend.app.api.v1.services.books import book_service
+
+    started = time.perf_counter()
+    init_db()
+    print(f"Migrated and indexed {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+    print(f"{'query':>16} {'hits':>5} {'median ms':>10} {'p95 ms':>8}")
+    db = SessionLocal()
+    try:
+        for query in args.queries:
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                hits = book_service.search_books(db, query, 0, args.limit)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{query:>16} {len(hits):>5} {statistics.median(samples):>10.2f} "
+                  f"{_percentile(samples, 0.95):>8.2f}")
+    finally:
+        db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+CPU per GET /v1/books/ request: ORM objects validated and encoded the way
+FastAPI does for a response_model, versus Core rows encoded straight to JSON.
+
+The FastAPI path is reproduced step by step (validate into BooksResponse,
+dump to JSON-able Python, jsonable_encoder, json.dumps) so the comparison
+leaves out routing and HTTP. Reports CPU milliseconds per page, for the
+query plus serialization, by page size.
+
+    python -m backend.benchmarks.bench_serialization --rows 100000 --limits 10 100 1000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from backend.benchmarks._data import seed_database
+
+
+def _cpu_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        fn()
+        samples.append((time.process_time() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    path = seed_database(args.rows)
+    # Settings are read on import, so point the app at the seeded database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from backend.app.core.sse import dispatcher
+    from backend.app.db.database import SessionLocal, init_db
+    from backend.app.db.models import Book
+    from backend.app.db.schemas.books import BooksResponse
+    from backend.app.api.v1.services.books import book_service, page_json
+
+    init_db()
+    adapter = TypeAdapter(BooksResponse)
+    db = SessionLocal()
+
+    def orm_path(limit: int):
+        books = db.execute(select(Book).order_by(Book.id).limit(limit)).scalars().all()
+        content = {"items": books, "total": args.rows, "skip": 0, "limit": limit, "next_cursor": None}
+        validated = adapter.validate_python(content, from_attributes=True)
+        encoded = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        body = json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+        db.expunge_all()
+        return body
+
+    def row_path(limit: int):
+        books, total, next_cursor = book_service.get_books(db, 0, limit)
+        return page_json(books, total, 0, limit, next_cursor)
+
+    print(f"{'limit':>6} {'orm + fastapi ms':>17} {'rows + to_json ms':>18} {'speedup':>8}")
+    try:
+        for limit in args.limits:
+            before = _cpu_ms(lambda: orm_path(limit), args.repeat)
+            after = _cpu_ms(lambda: row_path(limit), args.repeat)
+            print(f"{limit:>6} {before:>17.3f} {after:>18.3f} {before / after:>7.1f}x")
+    finally:
+        db.close()
+        dispatcher.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Concurrent read/write throughput of SQLite under each tuning profile.
+
+For every profile, seeds a fresh database and runs reader threads paging
+through GET /v1/books/-style listings alongside writer threads updating
+single books, each on its own pooled connection of an engine tuned the way
+the app tunes its own. Reports reads and writes per second and how many
+operations failed with "database is locked".
+
+    python -m backend.benchmarks.bench_sqlite --rows 200000 --readers 8 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import random
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from backend.app.db.database import sqlite_pragmas, tune_sqlite
+from backend.benchmarks._data import seed_database
+
+# name -> (journal_mode, synchronous, mmap_size, cache_size, busy_timeout_ms, temp_store)
+PROFILES = {
+    "sqlite-defaults": ("DELETE", "FULL", 0, -2000, 5000, "DEFAULT"),
+    "wal": ("WAL", "NORMAL", 0, -2000, 5000, "DEFAULT"),
+    "wal+cache+mmap": ("WAL", "NORMAL", 256 * 1024 * 1024, -64 * 1024, 5000, "MEMORY"),
+}
+
+_PAGE = text("SELECT * FROM books WHERE author = :author ORDER BY id LIMIT 10")
+_UPDATE = text("UPDATE books SET summary = :summary WHERE id = :id")
+
+
+def _worker(engine, operation, deadline: float, counts: dict, key: str):
+    done = failed = 0
+    rng = random.Random()
+    with engine.connect() as connection:
+        while time.perf_counter() < deadline:
+            try:
+                operation(connection, rng)
+                done += 1
+            except OperationalError:
+                connection.rollback()
+                failed += 1
+    with counts["lock"]:
+        counts[key] += done
+        counts["locked"] += failed
+
+
+def _run(path: str, pragmas: list, rows: int, readers: int, writers: int, seconds: float) -> dict:
+    engine = create_engine(f"sqlite:///{path}", pool_size=readers + writers, connect_args={"check_same_thread": False})
+    tune_sqlite(engine, pragmas)
+
+    def read(connection, rng):
+        connection.execute(_PAGE, {"author": f"Author {rng.randrange(5000)}"}).all()
+        connection.rollback()
+
+    def write(connection, rng):
+        connection.execute(_UPDATE, {"id": rng.randrange(1, rows + 1), "summary": f"Revised {rng.random()}"})
+        connection.commit()
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX IF NOT EXISTS ix_books_author ON books (author)"))
+    counts = {"reads": 0, "writes": 0, "locked": 0, "lock": threading.Lock()}
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=_worker, args=(engine, read, deadline, counts, "reads")) for _ in range(readers)]
+    threads += [threading.Thread(target=_worker, args=(engine, write, deadline, counts, "writes")) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':>16} {'reads/s':>9} {'writes/s':>9} {'locked':>7}")
+    for name in args.profiles:
+        path = seed_database(args.rows)
+        counts = _run(path, sqlite_pragmas(*PROFILES[name]), args.rows, args.readers, args.writers, args.seconds)
+        print(f"{name:>16} {counts['reads'] / args.seconds:>9.0f} {counts['writes'] / args.seconds:>9.0f} "
+              f"{counts['locked']:>7}")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Single-book write throughput: load-mutate-refresh through the ORM versus one
+UPDATE/DELETE ... RETURNING statement.
+
+Seeds and migrates a database, then times PATCH- and DELETE-style writes
+through BookService (one statement plus commit) against the previous ORM
+path (SELECT, flush, commit, refresh SELECT), reporting writes per second.
+
+    python -m backend.benchmarks.bench_writes --rows 100000 --writes 5000
+"""
+import argparse
+import os
+import time
+
+from backend.benchmarks._data import seed_database
+
+
+def _orm_update(SessionLocal, Book, book_id: int, title: str):
+    db = SessionLocal()
+    try:
+        db_book = db.query(Book).filter(Book.id == book_id).first()
+        db_book.title = title
+        db.commit()
+        db.refresh(db_book)
+    finally:
+        db.close()
+
+
+def _orm_delete(SessionLocal, Book, book_id: int):
+    db = SessionLocal()
+    try:
+        db_book = db.query(Book).filter(Book.id == book_id).first()
+        db.delete(db_book)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _rate(writes: int, fn) -> float:
+    started = time.perf_counter()
+    for i in range(writes):
+        fn(i)
+    return writes / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=5_000)
+    args = parser.parse_args()
+
+    path = seed_database(args.rows)
+    # Settings are read on import, so point the app at the seeded database first
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from backend.app.core.sse import dispatcher
+    from backend.app.db.database import SessionLocal, init_db
+    from backend.app.db.models import Book
+    from backend.app.db.schemas.books import BookPatch
+    from backend.app.api.v1.services.books import book_service
+
+    init_db()
+    n = args.writes
+    results = [
+        ("update (ORM)", _rate(n, lambda i: _orm_update(SessionLocal, Book, i + 1, f"Old {i}"))),
+        ("update (RETURNING)", _rate(n, lambda i: book_service.update_book_partially(
+            SessionLocal(), i + 1, BookPatch(title=f"New {i}")))),
+        ("delete (ORM)", _rate(n, lambda i: _orm_delete(SessionLocal, Book, i + 1))),
+        ("delete (RETURNING)", _rate(n, lambda i: book_service.delete_book(SessionLocal(), n + i + 1))),
+    ]
+    print(f"{'path':>20} {'writes/s':>9}")
+    for name, rate in results:
+        print(f"{name:>20} {rate:>9.0f}")
+    dispatcher.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()